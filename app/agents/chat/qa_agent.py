@@ -1,6 +1,7 @@
 """Grounded Q&A agent for chat flow."""
 
 import logging
+import math
 from typing import List, Tuple, Optional, Dict
 from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
@@ -152,8 +153,10 @@ Answer the user's question based on the context provided. Include citations in [
             page = doc.metadata.get('page', 'N/A')
             section = doc.metadata.get('section', 'N/A')
             content = doc.page_content[:500]  # Limit chunk preview
+            # NaN marks chunks the re-ranker could not score; leave relevance out
+            relevance = "" if math.isnan(score) else f", Relevance: {score:.3f}"
             context_parts.append(
-                f"[Chunk {i}] (Page {page}, Section: {section}, Relevance: {score:.3f})\n"
+                f"[Chunk {i}] (Page {page}, Section: {section}{relevance})\n"
                 f"{content}\n"
             )
         return "\n".join(context_parts)
@@ -192,13 +195,16 @@ Answer the user's question based on the context provided. Include citations in [
                 chunk_idx = int(ref) - 1  # Convert to 0-based index
                 if 0 <= chunk_idx < len(chunks):
                     doc, score = chunks[chunk_idx]
-                    citations.append({
+                    citation = {
                         "chunk_id": ref,
                         "page": doc.metadata.get('page', 'N/A'),
                         "section": doc.metadata.get('section', 'N/A'),
-                        "preview": doc.page_content[:200],
-                        "relevance_score": f"{score:.3f}"
-                    })
+                        "preview": doc.page_content[:200]
+                    }
+                    # Unscored (NaN) chunks have no relevance to show
+                    if not math.isnan(score):
+                        citation["relevance_score"] = f"{score:.3f}"
+                    citations.append(citation)
             except (ValueError, IndexError):
                 continue
         
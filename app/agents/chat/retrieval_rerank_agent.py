@@ -1,12 +1,13 @@
 """Retrieval and re-ranking agent for chat flow."""
 
 import logging
+import math
 from typing import List, Tuple
 from langchain_core.documents import Document
 
 from app.ingestion.vector_store import FAISSVectorStore
 from app.ingestion.embedder import NomicEmbedder
-from app.utils.reranker import BGEReranker
+from app.utils.reranker import get_reranker
 from app.config.settings import config
 
 logger = logging.getLogger(__name__)
@@ -23,7 +24,7 @@ class RetrievalRerankAgent:
         """
         self.vector_store = vector_store
         self.embedder = NomicEmbedder()
-        self.reranker = BGEReranker()
+        self.reranker = get_reranker()
     
     def retrieve_and_rerank(self, query: str) -> List[Tuple[Document, float]]:
         """Retrieve and re-rank documents for query.
@@ -48,16 +49,23 @@ class RetrievalRerankAgent:
                 logger.warning("No results from initial retrieval")
                 return []
             
-            # Extract documents
+            # Extract documents and their similarity scores
             documents = [doc for doc, score in initial_results]
+            similarities = [score for doc, score in initial_results]
             
             # Re-rank for better relevance
             reranked_results = self.reranker.rerank(
                 query=query,
                 documents=documents,
-                top_k=config.retrieval.rerank_top_k
+                top_k=config.retrieval.rerank_top_k,
+                prior_scores=similarities
             )
             
+            # NaN scores mean the documents were not re-ranked (too few to cut,
+            # or the re-ranker failed and logged why) and are in retrieval order
+            if any(math.isnan(score) for doc, score in reranked_results):
+                logger.info("Documents not re-ranked, using retrieval order")
+            
             logger.info(f"Retrieved and re-ranked {len(reranked_results)} documents")
             return reranked_results
             
@@ -6,7 +6,7 @@ from langchain_core.documents import Document
 
 from app.ingestion.vector_store import FAISSVectorStore
 from app.ingestion.embedder import NomicEmbedder
-from app.utils.reranker import BGEReranker
+from app.utils.reranker import get_reranker
 from app.config.settings import config
 
 logger = logging.getLogger(__name__)
@@ -23,7 +23,7 @@ class RetrievalAgent:
         """
         self.vector_store = vector_store
         self.embedder = NomicEmbedder()
-        self.reranker = BGEReranker()
+        self.reranker = get_reranker()
     
     def retrieve(self, query: Optional[str] = None) -> List[Document]:
         """Retrieve relevant chunks for KPI extraction.
@@ -55,14 +55,16 @@ class RetrievalAgent:
                 logger.warning("No results from initial retrieval")
                 return []
             
-            # Extract documents
+            # Extract documents and their similarity scores
             documents = [doc for doc, score in initial_results]
+            similarities = [score for doc, score in initial_results]
             
             # Re-rank for better relevance
             reranked_results = self.reranker.rerank(
                 query=query,
                 documents=documents,
-                top_k=config.retrieval.rerank_top_k
+                top_k=config.retrieval.rerank_top_k,
+                prior_scores=similarities
             )
             
             # Return top re-ranked documents
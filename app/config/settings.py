@@ -99,6 +99,8 @@ class EmbeddingConfig:
                 default_dim = dim
                 break
         self.dimension = get_int_env("EMBEDDING_DIMENSION", default_dim)
+        # Persist document embeddings keyed by text hash so re-ingestion skips the model
+        self.cache_enabled = get_bool_env("EMBEDDING_CACHE_ENABLED", True)
 
 
 class VectorStoreConfig:
@@ -107,6 +109,12 @@ class VectorStoreConfig:
     def __init__(self):
         self.index_path = Path(os.getenv("FAISS_INDEX_PATH", "./vector_store/faiss_index"))
         self.store_path = Path(os.getenv("VECTOR_STORE_PATH", "./vector_store"))
+        # FAISS OpenMP threads (0 = use all available cores)
+        self.num_threads = get_int_env("FAISS_NUM_THREADS", 0)
+        # Offload the index to GPU 0 when faiss-gpu is installed
+        self.use_gpu = get_bool_env("FAISS_USE_GPU", False)
+        # Buffer added vectors and add them to the index in batches of this size
+        self.flush_every = get_int_env("VECTOR_STORE_FLUSH_EVERY", 10000)
         
         # Create directories if they don't exist
         self.store_path.mkdir(parents=True, exist_ok=True)
@@ -119,6 +127,55 @@ class RerankerConfig:
     def __init__(self):
         self.model = os.getenv("BGE_RERANKER_MODEL", "BAAI/bge-large-en-v1.5")
         self.top_k = get_int_env("RERANKER_TOP_K", 10)
+        # Micro-batching: concurrent rerank calls arriving within batch_wait_ms
+        # share one compute_score call of up to max_batch pairs
+        self.max_batch = get_int_env("RERANKER_MAX_BATCH", 64)
+        self.batch_wait_ms = get_int_env("RERANKER_BATCH_WAIT_MS", 5)
+        # Pairs are scored in length-sorted sub-batches of this size to limit padding
+        self.batch_size = get_int_env("RERANKER_BATCH_SIZE", 32)
+        # Inference backend: "torch" (FlagReranker), "onnx" (ONNX Runtime CrossEncoder),
+        # "openvino" (OpenVINO CrossEncoder) or "vllm-http" (remote vLLM server
+        # started with --task score)
+        self.backend = os.getenv("RERANKER_BACKEND", "torch").lower()
+        # vllm-http backend: server base URL and the name it serves the model under
+        self.endpoint = os.getenv("RERANKER_ENDPOINT", "http://localhost:8000")
+        self.served_model = os.getenv("RERANKER_SERVED_MODEL") or self.model
+        # ONNX weights inside the model repo; the default is the dynamic INT8 AVX-512 VNNI export
+        self.onnx_file = os.getenv("RERANKER_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+        # openvino backend: inference precision. bf16 needs AVX-512 BF16/AMX CPUs; on
+        # older CPUs use the onnx backend's INT8 VNNI model instead (fp16 is slower on CPU)
+        self.openvino_precision = os.getenv("RERANKER_OPENVINO_PRECISION", "bf16")
+        # torch backend only: wrap the model in torch.compile and warm it up at load
+        self.compile = get_bool_env("RERANKER_COMPILE", False)
+        # torch backend on CUDA only: replay captured CUDA graphs for bucketed input shapes
+        self.cuda_graphs = get_bool_env("RERANKER_CUDA_GRAPHS", False)
+        # torch backend, opt-in: documents are tokenized once and their token ids reused
+        # across queries (LRU of token_cache_size documents). This bypasses
+        # FlagReranker.compute_score with its own pair truncation (queries capped at half
+        # of max_length), so scores can differ slightly; 0 (default) keeps FlagReranker.
+        # Documents are truncated to max_doc_tokens and every pair to max_length tokens.
+        self.token_cache_size = get_int_env("RERANKER_TOKEN_CACHE_SIZE", 0)
+        self.max_length = get_int_env("RERANKER_MAX_LENGTH", 512)
+        self.max_doc_tokens = get_int_env("RERANKER_MAX_DOC_TOKENS", 480)
+        # LRU cache of (query, document) scores; 0 disables it
+        self.cache_size = get_int_env("RERANKER_CACHE_SIZE", 4096)
+        # Score candidate lists even when they already fit within top_k
+        self.always_score = get_bool_env("RERANKER_ALWAYS_SCORE", False)
+        # Opt-in cascade: a small fast model (a sentence-transformers cross-encoder such
+        # as cross-encoder/ms-marco-MiniLM-L6-v2) scores every candidate, then the heavy
+        # model re-scores only the fast model's top cascade_top_n. Empty RERANKER_FAST_MODEL
+        # (the default) uses the heavy model alone; empty RERANKER_HEAVY_MODEL, fast only.
+        self.fast_model = os.getenv("RERANKER_FAST_MODEL", "")
+        self.heavy_model = os.getenv("RERANKER_HEAVY_MODEL", self.model)
+        self.cascade_top_n = get_int_env("RERANKER_CASCADE_TOP_N", 10)
+        # Opt-in early exit when callers pass retrieval scores: candidates are scored
+        # in chunks of early_exit_chunk, best retrieval score first, and scoring stops
+        # once the remaining candidates' predicted scores (online fit of re-ranker
+        # vs retrieval score, plus early_exit_margin residual std devs) can no longer
+        # reach the current top_k. Heuristic: a low-retrieval-score document that
+        # belongs in the top k can be skipped. 0 (default) scores every candidate.
+        self.early_exit_chunk = get_int_env("RERANKER_EARLY_EXIT_CHUNK", 0)
+        self.early_exit_margin = get_float_env("RERANKER_EARLY_EXIT_MARGIN", 2.0)
         # Optional: Hugging Face token for better rate limits (not required for public models)
         self.hf_token = os.getenv("HUGGINGFACE_API_TOKEN") or os.getenv("HF_TOKEN")
 
@@ -170,6 +227,7 @@ class AppConfig:
         self.retrieval = RetrievalConfig()
         self.llm_optimization = LLMOptimizationConfig()
         self.max_file_size_mb = get_int_env("MAX_FILE_SIZE_MB", 50)
+        self.max_history_messages = get_int_env("MAX_HISTORY_MESSAGES", 200)
         
         logger.info(f"Configuration loaded - LLM Provider: {self.llm.provider}, Model: {self.llm.model}")
         if self.llm_optimization.enabled:
@@ -1,8 +1,9 @@
 """Document loading utilities using LangChain and Docling."""
 
 import logging
+import shutil
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, List, Optional, Union
 from io import BytesIO
 
 from langchain_community.document_loaders import (
@@ -21,12 +22,17 @@ class DocumentLoader:
     def __init__(self):
         self.supported_extensions = {".pdf", ".txt", ".docx", ".doc"}
     
-    def load(self, file_path: str, file_content: Optional[bytes] = None) -> List[Document]:
+    def load(
+        self,
+        file_path: str,
+        file_content: Optional[Union[bytes, BinaryIO]] = None
+    ) -> List[Document]:
         """Load document from file path or file content.
         
         Args:
             file_path: Path to the document file
-            file_content: Optional file content as bytes (for Streamlit uploads)
+            file_content: Optional file content as bytes or a binary stream
+                positioned at the start (for Streamlit uploads)
             
         Returns:
             List of Document objects with metadata
@@ -71,14 +77,22 @@ class DocumentLoader:
         logger.info(f"Loaded {len(documents)} document chunks from {path}")
         return documents
     
-    def _load_from_bytes(self, content: bytes, extension: str, file_path: str) -> List[Document]:
-        """Load document from bytes (for Streamlit uploads)."""
+    def _load_from_bytes(
+        self,
+        content: Union[bytes, BinaryIO],
+        extension: str,
+        file_path: str
+    ) -> List[Document]:
+        """Load document from bytes or a binary stream (for Streamlit uploads)."""
         import tempfile
         import os
         
-        # Create temporary file
+        # Create temporary file; streams are copied in chunks rather than read whole
         with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp_file:
-            tmp_file.write(content)
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                tmp_file.write(content)
+            else:
+                shutil.copyfileobj(content, tmp_file, 1 << 20)
             tmp_path = tmp_file.name
         
         try:
@@ -1,7 +1,10 @@
 """Embedding generation using nomic-ai from Hugging Face."""
 
+import hashlib
 import logging
-from typing import List
+import sqlite3
+import threading
+from typing import Dict, List, Optional
 import numpy as np
 from langchain_core.documents import Document
 import os
@@ -9,6 +12,9 @@ from app.config.settings import config
 
 logger = logging.getLogger(__name__)
 
+# SQLite's default host-parameter limit is 999; stay well under it per lookup
+_CACHE_LOOKUP_BATCH = 500
+
 
 class NomicEmbedder:
     """Generate embeddings using nomic-ai models from Hugging Face."""
@@ -18,7 +24,11 @@ class NomicEmbedder:
         self.model_name = config.embedding.model
         self.hf_model_name = self.model_name
         self.dimension = config.embedding.dimension
+        # Embeddings are emitted unit-length so the vector store can skip normalization
+        self.normalize_embeddings = True
         self._model = None
+        self._cache: Optional[sqlite3.Connection] = None
+        self._cache_lock = threading.Lock()
         logger.info(f"Initializing embedder with model: {self.hf_model_name}")
     
     def _get_model(self):
@@ -69,6 +79,50 @@ class NomicEmbedder:
                 raise
         return self._model
     
+    def _get_cache(self) -> Optional[sqlite3.Connection]:
+        """Lazily open the on-disk embedding cache (hash -> vector)."""
+        if not config.embedding.cache_enabled:
+            return None
+        if self._cache is None:
+            cache_file = config.vector_store.store_path / "embeddings.db"
+            self._cache = sqlite3.connect(str(cache_file), check_same_thread=False)
+            self._cache.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+        return self._cache
+    
+    def _hash_text(self, text: str) -> bytes:
+        """Cache key for a text under the current model."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.hf_model_name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(text.encode("utf-8"))
+        return h.digest()
+    
+    def _lookup_cached(self, cache: sqlite3.Connection, hashes: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Fetch cached embeddings for the given hashes."""
+        found: Dict[bytes, np.ndarray] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._cache_lock:
+            for start in range(0, len(unique), _CACHE_LOOKUP_BATCH):
+                batch = unique[start:start + _CACHE_LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = cache.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE hash IN ({placeholders})", batch
+                ).fetchall()
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32)
+        return found
+    
+    def _store_cached(self, cache: sqlite3.Connection, hashes: List[bytes], embeddings: np.ndarray):
+        """Persist newly computed embeddings."""
+        with self._cache_lock:
+            cache.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, vector) VALUES (?, ?)",
+                [(key, row.tobytes()) for key, row in zip(hashes, embeddings)]
+            )
+            cache.commit()
+    
     def embed_documents(self, documents: List[Document], batch_size: int = 32) -> np.ndarray:
         """Generate embeddings for a list of documents.
         
@@ -82,22 +136,44 @@ class NomicEmbedder:
         texts = [doc.page_content for doc in documents]
         
         try:
-            model = self._get_model()
+            # Reuse embeddings for texts already embedded by a previous run
+            cache = self._get_cache()
+            hashes = [self._hash_text(text) for text in texts] if cache is not None else []
+            cached = self._lookup_cached(cache, hashes) if cache is not None else {}
+            miss_idx = [i for i in range(len(texts)) if not hashes or hashes[i] not in cached]
             
-            # Generate embeddings using sentence-transformers
-            # The model.encode() method handles batching automatically
-            embeddings_array = model.encode(
-                texts,
-                batch_size=batch_size,
-                show_progress_bar=False,
-                convert_to_numpy=True,
-                normalize_embeddings=True  # Normalize for cosine similarity
-            )
+            rows: List[Optional[np.ndarray]] = [cached.get(h) for h in hashes] if hashes else [None] * len(texts)
+            
+            if miss_idx:
+                model = self._get_model()
+                
+                # Generate embeddings using sentence-transformers
+                # The model.encode() method handles batching automatically
+                new_embeddings = model.encode(
+                    [texts[i] for i in miss_idx],
+                    batch_size=batch_size,
+                    show_progress_bar=False,
+                    convert_to_numpy=True,
+                    normalize_embeddings=self.normalize_embeddings  # Normalize for cosine similarity
+                )
+                
+                # Ensure float32 dtype
+                new_embeddings = np.array(new_embeddings, dtype=np.float32)
+                for i, row in zip(miss_idx, new_embeddings):
+                    rows[i] = row
+                
+                if cache is not None:
+                    self._store_cached(cache, [hashes[i] for i in miss_idx], new_embeddings)
             
-            # Ensure float32 dtype
-            embeddings_array = np.array(embeddings_array, dtype=np.float32)
+            if rows:
+                embeddings_array = np.vstack(rows).astype(np.float32, copy=False)
+            else:
+                embeddings_array = np.empty((0, self.dimension), dtype=np.float32)
             
-            logger.info(f"Generated embeddings for {len(documents)} documents: shape {embeddings_array.shape}")
+            logger.info(
+                f"Generated embeddings for {len(documents)} documents "
+                f"({len(documents) - len(miss_idx)} from cache): shape {embeddings_array.shape}"
+            )
             
             return embeddings_array
             
@@ -121,7 +197,7 @@ class NomicEmbedder:
             embedding = model.encode(
                 query,
                 convert_to_numpy=True,
-                normalize_embeddings=True  # Normalize for cosine similarity
+                normalize_embeddings=self.normalize_embeddings  # Normalize for cosine similarity
             )
             
             # Ensure float32 dtype and 1D array
@@ -2,7 +2,7 @@
 
 import logging
 from pathlib import Path
-from typing import List, Optional, Callable
+from typing import BinaryIO, List, Optional, Callable, Union
 from langchain_core.documents import Document
 
 from app.ingestion.document_loader import DocumentLoader
@@ -32,14 +32,15 @@ class IngestionPipeline:
     def ingest(
         self,
         file_path: str,
-        file_content: Optional[bytes] = None,
+        file_content: Optional[Union[bytes, BinaryIO]] = None,
         document_id: Optional[str] = None
     ) -> FAISSVectorStore:
         """Run complete ingestion pipeline.
         
         Args:
             file_path: Path to document or filename
-            file_content: Optional file content as bytes (for Streamlit uploads)
+            file_content: Optional file content as bytes or a binary stream
+                (for Streamlit uploads)
             document_id: Optional unique document identifier
             
         Returns:
@@ -73,7 +74,11 @@ class IngestionPipeline:
             # Step 4: Create vector store
             self._update_progress("Creating vector index...", 0.8)
             self.vector_store.clear()
-            self.vector_store.add_documents(chunked_documents, embeddings)
+            self.vector_store.add_documents(
+                chunked_documents,
+                embeddings,
+                already_normalized=self.embedder.normalize_embeddings
+            )
             
             # Step 5: Save to disk
             self._update_progress("Saving vector store...", 0.9)
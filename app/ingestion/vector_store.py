@@ -1,17 +1,35 @@
 """FAISS vector store implementation."""
 
 import logging
+import math
+import os
 import pickle
 from pathlib import Path
 from typing import List, Optional, Tuple
+import msgpack
 import numpy as np
 import faiss
+import zstandard as zstd
 from langchain_core.documents import Document
 
 from app.config.settings import config
 
 logger = logging.getLogger(__name__)
 
+# Frame header written by zstandard; legacy document files are plain pickles
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _as_f32_contig(a: np.ndarray, copy: bool = False) -> np.ndarray:
+    """Return ``a`` as a C-contiguous float32 array, copying only if needed.
+    
+    Pass ``copy=True`` when the result will be modified in place (e.g. by
+    ``faiss.normalize_L2``), so the caller's array is never overwritten.
+    """
+    if not copy and a.dtype == np.float32 and a.flags.c_contiguous:
+        return a
+    return np.array(a, dtype=np.float32, order="C", copy=True)
+
 
 class FAISSVectorStore:
     """FAISS-based vector store for document embeddings."""
@@ -25,18 +43,64 @@ class FAISSVectorStore:
         self.dimension = dimension or config.embedding.dimension
         self.index_path = config.vector_store.index_path
         self.store_path = config.vector_store.store_path
+        # Model the embeddings came from; None for stores saved before it was recorded
+        self.embedding_model: Optional[str] = config.embedding.model
         self.index: Optional[faiss.Index] = None
-        self.documents: List[Document] = []
+        # Document texts live in one UTF-8 buffer; row i spans _offsets[i]:_offsets[i + 1]
+        self._text_buf = bytearray()
+        self._offsets: List[int] = [0]
+        self._metadata: List[dict] = []
+        # Embeddings buffered by add_documents until flush() adds them in one call
+        self.flush_every = config.vector_store.flush_every
+        self._pending_embeds: List[np.ndarray] = []
+        self._pending_docs: List[Document] = []
+        self._pending_needs_norm = False
+        self.use_gpu = config.vector_store.use_gpu
+        self._gpu_resources = None
+        
+        # Match FAISS's BLAS/OpenMP parallelism to the available cores
+        faiss.omp_set_num_threads(config.vector_store.num_threads or os.cpu_count() or 1)
         
         # Create directories
         self.store_path.mkdir(parents=True, exist_ok=True)
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
     
-    def create_index(self, embeddings: np.ndarray):
+    @property
+    def documents(self) -> List[Document]:
+        """All stored documents, materialized on access."""
+        self.flush()
+        return [self._get_document(i) for i in range(len(self._metadata))]
+    
+    def _get_document(self, idx: int) -> Document:
+        """Rebuild the Document stored at row ``idx``."""
+        text = self._text_buf[self._offsets[idx]:self._offsets[idx + 1]].decode("utf-8")
+        return Document(page_content=text, metadata=self._metadata[idx])
+    
+    def _append_documents(self, documents: List[Document]):
+        """Append documents to the text buffer and metadata rows."""
+        for doc in documents:
+            self._text_buf += doc.page_content.encode("utf-8")
+            self._offsets.append(len(self._text_buf))
+            self._metadata.append(doc.metadata)
+    
+    def _to_device(self, index: faiss.Index) -> faiss.Index:
+        """Move an index to GPU if configured and supported."""
+        if not self.use_gpu:
+            return index
+        if not hasattr(faiss, "StandardGpuResources"):
+            logger.warning("FAISS_USE_GPU is set but faiss was built without GPU support, using CPU index")
+            self.use_gpu = False
+            return index
+        if self._gpu_resources is None:
+            self._gpu_resources = faiss.StandardGpuResources()
+        return faiss.index_cpu_to_gpu(self._gpu_resources, 0, index)
+    
+    def create_index(self, embeddings: np.ndarray, already_normalized: bool = False):
         """Create FAISS index from embeddings.
         
         Args:
             embeddings: numpy array of embeddings with shape (n_documents, dimension)
+            already_normalized: Skip L2 normalization if embeddings are unit-length
         """
         if embeddings.shape[1] != self.dimension:
             # Update dimension to match actual embeddings
@@ -46,21 +110,31 @@ class FAISSVectorStore:
             )
             self.dimension = embeddings.shape[1]
         
+        # normalize_L2 works in place, so normalize a copy, not the caller's array
+        embeddings = _as_f32_contig(embeddings, copy=not already_normalized)
+        
         # Normalize embeddings for cosine similarity
-        faiss.normalize_L2(embeddings)
+        if not already_normalized:
+            faiss.normalize_L2(embeddings)
         
         # Create FAISS index (Inner Product for cosine similarity)
-        self.index = faiss.IndexFlatIP(self.dimension)
-        self.index.add(embeddings.astype('float32'))
+        self.index = self._to_device(faiss.IndexFlatIP(self.dimension))
+        self.index.add(embeddings)
         
         logger.info(f"Created FAISS index with {self.index.ntotal} vectors")
     
-    def add_documents(self, documents: List[Document], embeddings: np.ndarray):
+    def add_documents(
+        self,
+        documents: List[Document],
+        embeddings: np.ndarray,
+        already_normalized: bool = False
+    ):
         """Add documents and their embeddings to the store.
         
         Args:
             documents: List of Document objects
             embeddings: numpy array of embeddings
+            already_normalized: Skip L2 normalization if embeddings are unit-length
         """
         if len(documents) != embeddings.shape[0]:
             raise ValueError(
@@ -68,16 +142,40 @@ class FAISSVectorStore:
                 f"{embeddings.shape[0]} embeddings"
             )
         
+        self._pending_embeds.append(embeddings)
+        self._pending_docs.extend(documents)
+        self._pending_needs_norm = self._pending_needs_norm or not already_normalized
+        
+        if len(self._pending_docs) >= self.flush_every:
+            self.flush()
+        
+        logger.info(f"Added {len(documents)} documents. Total: {self.get_document_count()}")
+    
+    def flush(self):
+        """Add all buffered embeddings to the index in a single call."""
+        if not self._pending_embeds:
+            return
+        
+        needs_norm = self._pending_needs_norm
+        if len(self._pending_embeds) == 1:
+            # A single batch may be the caller's own array; copy it before normalizing
+            embeddings = _as_f32_contig(self._pending_embeds[0], copy=needs_norm)
+        else:
+            embeddings = np.concatenate(self._pending_embeds, dtype=np.float32)
+        
+        # Normalize new embeddings (embeddings is our own array at this point)
+        if needs_norm:
+            faiss.normalize_L2(embeddings)
+        
         if self.index is None:
-            self.create_index(embeddings)
+            self.create_index(embeddings, already_normalized=True)
         else:
-            # Normalize new embeddings
-            normalized_embeddings = embeddings.astype('float32')
-            faiss.normalize_L2(normalized_embeddings)
-            self.index.add(normalized_embeddings)
+            self.index.add(embeddings)
         
-        self.documents.extend(documents)
-        logger.info(f"Added {len(documents)} documents. Total: {len(self.documents)}")
+        self._append_documents(self._pending_docs)
+        self._pending_embeds = []
+        self._pending_docs = []
+        self._pending_needs_norm = False
     
     def search(
         self,
@@ -95,30 +193,35 @@ class FAISSVectorStore:
         Returns:
             List of (Document, similarity_score) tuples
         """
-        if self.index is None or len(self.documents) == 0:
+        self.flush()
+        if self.index is None or len(self._metadata) == 0:
             logger.warning("Index is empty, returning empty results")
             return []
         
-        # Normalize query embedding
-        query_vector = query_embedding.reshape(1, -1).astype('float32')
-        faiss.normalize_L2(query_vector)
+        # Normalize a contiguous float32 copy of the query in place with one scalar
+        # rsqrt scale (a single vector, so this beats normalize_L2); the caller's
+        # embedding is untouched and zero vectors are left as-is
+        query_vector = _as_f32_contig(query_embedding.reshape(1, -1), copy=True)
+        sq_norm = float(np.dot(query_vector[0], query_vector[0]))
+        if sq_norm > 0.0:
+            query_vector *= np.float32(1.0 / math.sqrt(sq_norm))
         
         # Search
         k = min(k, self.index.ntotal)
         similarities, indices = self.index.search(query_vector, k)
         
         # Get documents and scores
+        # Documents are only rebuilt for hits that survive the metadata filter
         results = []
         for idx, score in zip(indices[0], similarities[0]):
-            if idx < len(self.documents):
-                doc = self.documents[idx]
-                
+            if 0 <= idx < len(self._metadata):
                 # Apply metadata filter if provided
                 if filter_metadata:
-                    if all(doc.metadata.get(k) == v for k, v in filter_metadata.items()):
-                        results.append((doc, float(score)))
+                    metadata = self._metadata[idx]
+                    if all(metadata.get(k) == v for k, v in filter_metadata.items()):
+                        results.append((self._get_document(idx), float(score)))
                 else:
-                    results.append((doc, float(score)))
+                    results.append((self._get_document(idx), float(score)))
         
         return results
     
@@ -128,19 +231,28 @@ class FAISSVectorStore:
         Args:
             file_prefix: Optional prefix for saved files
         """
+        self.flush()
         if self.index is None:
             raise ValueError("No index to save")
         
         prefix = file_prefix or self.index_path.stem
         index_file = self.index_path.parent / f"{prefix}.faiss"
-        docs_file = self.index_path.parent / f"{prefix}.pkl"
+        docs_file = self.index_path.parent / f"{prefix}.docs"
         
-        # Save FAISS index
-        faiss.write_index(self.index, str(index_file))
+        # Save FAISS index (GPU indexes must be copied back to CPU first)
+        cpu_index = faiss.index_gpu_to_cpu(self.index) if self._gpu_resources is not None else self.index
+        faiss.write_index(cpu_index, str(index_file))
         
-        # Save documents
+        # Save documents as zstd-compressed msgpack
+        payload = {
+            "text": bytes(self._text_buf),
+            "offsets": np.asarray(self._offsets, dtype=np.int64).tobytes(),
+            "meta": self._metadata,
+            "model": self.embedding_model,
+        }
+        buf = msgpack.packb(payload, use_bin_type=True)
         with open(docs_file, 'wb') as f:
-            pickle.dump(self.documents, f)
+            f.write(zstd.ZstdCompressor(level=3).compress(buf))
         
         logger.info(f"Saved vector store to {index_file} and {docs_file}")
     
@@ -152,26 +264,53 @@ class FAISSVectorStore:
         """
         prefix = file_prefix or self.index_path.stem
         index_file = self.index_path.parent / f"{prefix}.faiss"
-        docs_file = self.index_path.parent / f"{prefix}.pkl"
+        docs_file = self.index_path.parent / f"{prefix}.docs"
+        if not docs_file.exists():
+            # Stores saved before the msgpack format used a pickle file
+            docs_file = self.index_path.parent / f"{prefix}.pkl"
         
         if not index_file.exists() or not docs_file.exists():
             raise FileNotFoundError(f"Vector store files not found: {index_file}, {docs_file}")
         
-        # Load FAISS index
-        self.index = faiss.read_index(str(index_file))
+        # Load FAISS index; its stored width is authoritative from here on
+        self.index = self._to_device(faiss.read_index(str(index_file)))
+        self.dimension = self.index.d
         
         # Load documents
         with open(docs_file, 'rb') as f:
-            self.documents = pickle.load(f)
+            raw = f.read()
+        self._text_buf = bytearray()
+        self._offsets = [0]
+        self._metadata = []
+        self.embedding_model = None
+        if raw.startswith(_ZSTD_MAGIC):
+            payload = msgpack.unpackb(zstd.ZstdDecompressor().decompress(raw), raw=False)
+            if isinstance(payload, dict):
+                self._text_buf = bytearray(payload["text"])
+                self._offsets = np.frombuffer(payload["offsets"], dtype=np.int64).tolist()
+                self._metadata = payload["meta"]
+                self.embedding_model = payload.get("model")
+            else:
+                # Early msgpack stores kept one {"text", "meta"} record per document
+                self._append_documents([
+                    Document(page_content=item["text"], metadata=item["meta"]) for item in payload
+                ])
+        else:
+            self._append_documents(pickle.loads(raw))
         
-        logger.info(f"Loaded vector store: {len(self.documents)} documents, {self.index.ntotal} vectors")
+        logger.info(f"Loaded vector store: {len(self._metadata)} documents, {self.index.ntotal} vectors")
     
     def clear(self):
         """Clear the vector store."""
         self.index = None
-        self.documents = []
+        self._text_buf = bytearray()
+        self._offsets = [0]
+        self._metadata = []
+        self._pending_embeds = []
+        self._pending_docs = []
+        self._pending_needs_norm = False
         logger.info("Cleared vector store")
     
     def get_document_count(self) -> int:
         """Get the number of documents in the store."""
-        return len(self.documents)
+        return len(self._metadata) + len(self._pending_docs)
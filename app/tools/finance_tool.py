@@ -144,15 +144,20 @@ class FinanceTool:
             if "error" in info:
                 return f"Error: {info['error']}"
             
-            formatted = f"Stock Information for {info['symbol']}:\n\n"
-            formatted += f"Company: {info['name']}\n"
-            formatted += f"Current Price: ${info['current_price']}\n"
-            formatted += f"Market Cap: ${info['market_cap']:,}\n" if isinstance(info['market_cap'], (int, float)) else f"Market Cap: {info['market_cap']}\n"
-            formatted += f"P/E Ratio: {info['pe_ratio']}\n"
-            formatted += f"Dividend Yield: {info['dividend_yield']}\n"
-            formatted += f"52 Week High: ${info['52_week_high']}\n"
-            formatted += f"52 Week Low: ${info['52_week_low']}\n"
-            return formatted
+            market_cap = info['market_cap']
+            parts = [
+                f"Stock Information for {info['symbol']}:",
+                "",
+                f"Company: {info['name']}",
+                f"Current Price: ${info['current_price']}",
+                f"Market Cap: ${market_cap:,}" if isinstance(market_cap, (int, float)) else f"Market Cap: {market_cap}",
+                f"P/E Ratio: {info['pe_ratio']}",
+                f"Dividend Yield: {info['dividend_yield']}",
+                f"52 Week High: ${info['52_week_high']}",
+                f"52 Week Low: ${info['52_week_low']}",
+                "",
+            ]
+            return "\n".join(parts)
         
         elif action == "historical_data" and resolved_symbol:
             period = kwargs.get("period", "1mo")
@@ -160,13 +165,17 @@ class FinanceTool:
             if "error" in data:
                 return f"Error: {data['error']}"
             
-            formatted = f"Historical Data for {data['symbol']} ({data['period']}):\n\n"
-            formatted += f"Period: {data['start_date']} to {data['end_date']}\n"
-            formatted += f"Current Close: ${data['close']:.2f}\n"
-            formatted += f"High: ${data['high']:.2f}\n"
-            formatted += f"Low: ${data['low']:.2f}\n"
-            formatted += f"Total Volume: {data['volume']:,}\n"
-            return formatted
+            parts = [
+                f"Historical Data for {data['symbol']} ({data['period']}):",
+                "",
+                f"Period: {data['start_date']} to {data['end_date']}",
+                f"Current Close: ${data['close']:.2f}",
+                f"High: ${data['high']:.2f}",
+                f"Low: ${data['low']:.2f}",
+                f"Total Volume: {data['volume']:,}",
+                "",
+            ]
+            return "\n".join(parts)
         
         return (
             "Invalid action or missing symbol. Use 'stock_info' or 'historical_data' with a symbol, "
@@ -1,11 +1,35 @@
 """GDP and economic data tool."""
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so repeated World Bank calls reuse keep-alive connections
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+_session.mount("https://", _adapter)
+
+# GDP data is published at most yearly, so successful lookups are cached for an hour
+_gdp_cache: TTLCache = TTLCache(maxsize=128, ttl=3600)
+_gdp_cache_lock = threading.Lock()
+
+# Additional World Bank indicators fetched alongside GDP by get_economic_indicators
+_EXTRA_INDICATORS = {
+    "inflation": "FP.CPI.TOTL.ZG",
+    "unemployment": "SL.UEM.TOTL.ZS",
+}
+
 
 class GDPTool:
     """GDP and economic indicators tool."""
@@ -19,6 +43,47 @@ class GDPTool:
         self.api_key = api_key
         self.fred_api_key = api_key  # Federal Reserve Economic Data
     
+    @staticmethod
+    def _to_country_code(country: str) -> str:
+        """Map short country codes to World Bank ISO3 codes."""
+        if country.upper() == "US":
+            return "USA"
+        elif country.upper() == "IN":
+            return "IND"
+        elif country.upper() == "CN":
+            return "CHN"
+        return country.upper()
+    
+    def get_indicator(self, country: str, indicator: str) -> Dict[str, Any]:
+        """Get the latest available value of a World Bank indicator.
+        
+        Args:
+            country: Country code
+            indicator: World Bank indicator code (e.g., 'FP.CPI.TOTL.ZG')
+            
+        Returns:
+            Dictionary with year and value, or an error
+        """
+        try:
+            country_code = self._to_country_code(country)
+            url = f"https://api.worldbank.org/v2/country/{country_code}/indicator/{indicator}"
+            response = _session.get(url, params={"format": "json", "per_page": 10}, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            
+            if not isinstance(data, list) or len(data) < 2 or not data[1]:
+                return {"error": f"No data found for {indicator} in {country}"}
+            
+            for entry in data[1]:
+                if entry.get("value") is not None:
+                    return {"year": entry.get("date"), "value": float(entry["value"])}
+            
+            return {"error": f"No value available for {indicator} in {country}"}
+            
+        except Exception as e:
+            logger.error(f"Error getting indicator {indicator}: {str(e)}")
+            return {"error": str(e)}
+    
     def get_gdp_data(self, country: str = "US", year: Optional[int] = None) -> Dict[str, Any]:
         """Get GDP data for a country.
         
@@ -31,21 +96,20 @@ class GDPTool:
         """
         try:
             # Using World Bank API (free, no key required)
-            if country.upper() == "US":
-                country_code = "USA"
-            elif country.upper() == "IN":
-                country_code = "IND"
-            elif country.upper() == "CN":
-                country_code = "CHN"
-            else:
-                country_code = country.upper()
+            country_code = self._to_country_code(country)
+            
+            cache_key = (country_code, year)
+            with _gdp_cache_lock:
+                cached = _gdp_cache.get(cache_key)
+            if cached is not None:
+                return dict(cached, country=country)
             
             url = f"https://api.worldbank.org/v2/country/{country_code}/indicator/NY.GDP.MKTP.CD"
             params = {"format": "json", "per_page": 10}
             if year:
                 params["date"] = f"{year}:{year}"
             
-            response = requests.get(url, params=params, timeout=10)
+            response = _session.get(url, params=params, timeout=10)
             response.raise_for_status()  # Raise exception for bad status codes
             data = response.json()
             
@@ -62,7 +126,7 @@ class GDPTool:
                     # Year not available, try without year filter
                     logger.info(f"No data for {year}, fetching latest available")
                     params_no_year = {"format": "json", "per_page": 10}
-                    response = requests.get(url, params=params_no_year, timeout=10)
+                    response = _session.get(url, params=params_no_year, timeout=10)
                     response.raise_for_status()
                     data = response.json()
                     data_array = data[1] if len(data) > 1 else []
@@ -82,12 +146,15 @@ class GDPTool:
                             break
                 
                 if gdp_value is not None:
-                    return {
+                    result = {
                         "country": country,
                         "year": latest.get("date"),
                         "gdp_usd": float(gdp_value),
                         "indicator": latest.get("indicator", {}).get("value", "GDP") if isinstance(latest.get("indicator"), dict) else "GDP"
                     }
+                    with _gdp_cache_lock:
+                        _gdp_cache[cache_key] = result
+                    return result
                 else:
                     logger.warning(f"GDP data found but value is None for {country}")
                     return {"error": f"GDP data exists but value is not available for {country}"}
@@ -107,13 +174,20 @@ class GDPTool:
         Returns:
             Dictionary with economic indicators
         """
-        # This is a simplified version - can be extended with FRED API if key provided
-        gdp_data = self.get_gdp_data(country)
+        # Indicators are independent network calls, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=len(_EXTRA_INDICATORS) + 1) as executor:
+            gdp_future = executor.submit(self.get_gdp_data, country)
+            extra_futures = {
+                name: executor.submit(self.get_indicator, country, code)
+                for name, code in _EXTRA_INDICATORS.items()
+            }
+            gdp_data = gdp_future.result()
+            extra_data = {name: future.result() for name, future in extra_futures.items()}
         
         return {
             "country": country,
             "gdp": gdp_data,
-            "note": "Additional indicators available with FRED API key"
+            **extra_data,
         }
     
     def __call__(self, action: str, country: Optional[str] = None, **kwargs) -> str:
@@ -139,23 +213,31 @@ class GDPTool:
                     return f"GDP data for {year} is not available yet. The latest available data will be shown instead. {error_msg}"
                 return f"Error: {error_msg}"
             
-            formatted = f"GDP Data for {data['country']}:\n\n"
-            formatted += f"Year: {data['year']}\n"
+            parts = [f"GDP Data for {data['country']}:", "", f"Year: {data['year']}"]
             if data.get('gdp_usd'):
                 gdp_billions = data['gdp_usd'] / 1e9
-                formatted += f"GDP: ${gdp_billions:.2f} billion USD\n"
+                parts.append(f"GDP: ${gdp_billions:.2f} billion USD")
                 if year and str(data['year']) != str(year):
-                    formatted += f"\nNote: Data for {year} is not available yet. Showing latest available year ({data['year']}).\n"
-            return formatted
+                    parts.append("")
+                    parts.append(f"Note: Data for {year} is not available yet. Showing latest available year ({data['year']}).")
+            parts.append("")
+            return "\n".join(parts)
         
         elif action == "indicators":
             data = self.get_economic_indicators(country)
-            formatted = f"Economic Indicators for {data['country']}:\n\n"
+            parts = [f"Economic Indicators for {data['country']}:", ""]
             if data.get('gdp'):
                 gdp = data['gdp']
                 if 'gdp_usd' in gdp and gdp['gdp_usd']:
                     gdp_billions = gdp['gdp_usd'] / 1e9
-                    formatted += f"GDP ({gdp.get('year', 'N/A')}): ${gdp_billions:.2f} billion USD\n"
-            return formatted
+                    parts.append(f"GDP ({gdp.get('year', 'N/A')}): ${gdp_billions:.2f} billion USD")
+            inflation = data.get('inflation') or {}
+            if 'value' in inflation:
+                parts.append(f"Inflation ({inflation.get('year', 'N/A')}): {inflation['value']:.2f}%")
+            unemployment = data.get('unemployment') or {}
+            if 'value' in unemployment:
+                parts.append(f"Unemployment ({unemployment.get('year', 'N/A')}): {unemployment['value']:.2f}%")
+            parts.append("")
+            return "\n".join(parts)
         
         return "Invalid action. Use 'gdp' or 'indicators' with a country code."
@@ -0,0 +1,213 @@
+"""httpx transport with an in-process DNS cache."""
+
+import logging
+import socket
+import ssl
+import threading
+import urllib.request
+from typing import Dict, Iterator, List, Optional, Union
+import certifi
+import httpcore
+import httpx
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Resolved addresses keyed by (host, port), shared by every transport in the process
+_dns_cache: TTLCache = TTLCache(maxsize=64, ttl=300)
+_dns_cache_lock = threading.Lock()
+
+# httpcore exceptions and the httpx exceptions HTTPTransport raises for them
+_HTTPCORE_EXC_MAP: Dict[type, type] = {
+    httpcore.TimeoutException: httpx.TimeoutException,
+    httpcore.ConnectTimeout: httpx.ConnectTimeout,
+    httpcore.ReadTimeout: httpx.ReadTimeout,
+    httpcore.WriteTimeout: httpx.WriteTimeout,
+    httpcore.PoolTimeout: httpx.PoolTimeout,
+    httpcore.NetworkError: httpx.NetworkError,
+    httpcore.ConnectError: httpx.ConnectError,
+    httpcore.ReadError: httpx.ReadError,
+    httpcore.WriteError: httpx.WriteError,
+    httpcore.ProxyError: httpx.ProxyError,
+    httpcore.UnsupportedProtocol: httpx.UnsupportedProtocol,
+    httpcore.ProtocolError: httpx.ProtocolError,
+    httpcore.LocalProtocolError: httpx.LocalProtocolError,
+    httpcore.RemoteProtocolError: httpx.RemoteProtocolError,
+}
+
+
+def resolve_host(host: str, port: int) -> List[str]:
+    """Resolve a hostname to its IP addresses, consulting the cache first.
+    
+    Args:
+        host: Hostname to resolve
+        port: Port the connection will use
+        
+    Returns:
+        IP address strings in getaddrinfo order (duplicates removed)
+    """
+    key = (host, port)
+    with _dns_cache_lock:
+        addresses = _dns_cache.get(key)
+    if addresses is not None:
+        return addresses
+    
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    with _dns_cache_lock:
+        _dns_cache[key] = addresses
+    logger.debug(f"Resolved {host} to {addresses}")
+    return addresses
+
+
+def evict_host(host: str, port: int):
+    """Forget cached addresses (e.g. after every address failed to connect)."""
+    with _dns_cache_lock:
+        _dns_cache.pop((host, port), None)
+
+
+class CachingNetworkBackend(httpcore.SyncBackend):
+    """httpcore backend that connects to cached DNS results.
+    
+    Like socket.create_connection, every resolved address is tried in turn,
+    so an unreachable first record (e.g. IPv6 without IPv6 routing) falls
+    through to the next one. TLS still uses the original hostname for SNI and
+    certificate checks, since httpcore passes it separately when starting TLS.
+    """
+    
+    def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options=None,
+    ) -> httpcore.NetworkStream:
+        last_error: Optional[Exception] = None
+        for address in resolve_host(host, port):
+            try:
+                return super().connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except Exception as e:
+                last_error = e
+        # Every cached address failed and may be stale; resolve again on the next attempt
+        evict_host(host, port)
+        if last_error is None:
+            raise httpcore.ConnectError(f"No addresses found for {host}")
+        raise last_error
+
+
+def _raise_mapped(exc: Exception):
+    """Re-raise an httpcore exception as the httpx one HTTPTransport would raise."""
+    for cls in type(exc).__mro__:
+        mapped = _HTTPCORE_EXC_MAP.get(cls)
+        if mapped is not None:
+            raise mapped(str(exc)) from exc
+    raise exc
+
+
+class _ResponseStream(httpx.SyncByteStream):
+    """httpx response stream over an httpcore response stream."""
+    
+    def __init__(self, httpcore_stream):
+        self._httpcore_stream = httpcore_stream
+    
+    def __iter__(self) -> Iterator[bytes]:
+        try:
+            for part in self._httpcore_stream:
+                yield part
+        except Exception as e:
+            _raise_mapped(e)
+    
+    def close(self):
+        if hasattr(self._httpcore_stream, "close"):
+            self._httpcore_stream.close()
+
+
+class CachingTransport(httpx.BaseTransport):
+    """httpx transport over an httpcore pool that resolves hosts via the DNS cache.
+    
+    The pool is built here with CachingNetworkBackend passed through
+    httpcore.ConnectionPool's public network_backend argument; requests and
+    responses are mapped the same way httpx.HTTPTransport maps them.
+    
+    Only suitable for direct connections: a client given an explicit
+    transport no longer mounts the HTTP(S)_PROXY transports from the
+    environment, so callers should skip it when a proxy is configured
+    (see proxy_configured).
+    """
+    
+    def __init__(
+        self,
+        verify: Union[bool, ssl.SSLContext] = True,
+        limits: httpx.Limits = httpx.Limits(),
+        retries: int = 0,
+    ):
+        """Initialize the connection pool.
+        
+        Args:
+            verify: Verify TLS certificates (or an SSL context to use)
+            limits: Connection pool limits
+            retries: Connection retries on connect errors
+        """
+        self._pool = httpcore.ConnectionPool(
+            ssl_context=self._ssl_context(verify),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            retries=retries,
+            network_backend=CachingNetworkBackend(),
+        )
+    
+    @staticmethod
+    def _ssl_context(verify: Union[bool, ssl.SSLContext]) -> ssl.SSLContext:
+        """SSL context for the pool, verifying against certifi's CA bundle by default."""
+        if isinstance(verify, ssl.SSLContext):
+            return verify
+        if verify:
+            return ssl.create_default_context(cafile=certifi.where())
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+    
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request through the pool and wrap the response for httpx."""
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            core_response = self._pool.handle_request(core_request)
+        except Exception as e:
+            _raise_mapped(e)
+        
+        return httpx.Response(
+            status_code=core_response.status,
+            headers=core_response.headers,
+            stream=_ResponseStream(core_response.stream),
+            extensions=core_response.extensions,
+        )
+    
+    def close(self):
+        """Close every pooled connection."""
+        self._pool.close()
+
+
+def proxy_configured() -> bool:
+    """Whether an HTTP(S) proxy is set in the environment (HTTP_PROXY etc.)."""
+    proxies = urllib.request.getproxies()
+    return any(scheme in proxies for scheme in ("http", "https", "all"))
@@ -1,11 +1,10 @@
 """Tool registry for agentic RAG system."""
 
+import atexit
 import logging
-from typing import Dict, Callable, Any, Optional
-from app.tools.web_search import WebSearchTool
-from app.tools.finance_tool import FinanceTool
-from app.tools.gdp_tool import GDPTool
-from app.config.settings import config
+import os
+import threading
+from typing import Dict, Callable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -15,30 +14,21 @@ class ToolRegistry:
     
     def __init__(self):
         """Initialize tool registry."""
-        self.tools: Dict[str, Callable] = {}
+        self._factories: Dict[str, Callable[[], Callable]] = {}
+        self._instances: Dict[str, Callable] = {}
+        self._instances_lock = threading.Lock()
         self._initialize_tools()
     
     def _initialize_tools(self):
-        """Initialize all available tools."""
-        import os
+        """Register factories for all available tools.
         
-        # Web Search Tool (Tavily recommended for RAG)
-        web_search_key = os.getenv("TAVILY_API_KEY") or os.getenv("SERPAPI_API_KEY") or os.getenv("WEB_SEARCH_API_KEY")
-        web_search_provider = os.getenv("WEB_SEARCH_PROVIDER", "tavily")
-        self.tools["web_search"] = WebSearchTool(
-            api_key=web_search_key,
-            provider=web_search_provider
-        )
-        logger.info(f"Registered web_search tool with provider: {web_search_provider}")
-        
-        # Finance Tool
-        self.tools["finance"] = FinanceTool()
-        logger.info("Registered finance tool")
-        
-        # GDP Tool
-        gdp_api_key = os.getenv("FRED_API_KEY") or os.getenv("GDP_API_KEY")
-        self.tools["gdp"] = GDPTool(api_key=gdp_api_key)
-        logger.info("Registered gdp tool")
+        Tools (and their provider SDKs) are only imported and constructed
+        the first time they are requested.
+        """
+        self._factories["web_search"] = _create_web_search_tool
+        self._factories["finance"] = _create_finance_tool
+        self._factories["gdp"] = _create_gdp_tool
+        logger.info(f"Registered tools: {', '.join(self._factories)}")
     
     def get_tool(self, tool_name: str) -> Optional[Callable]:
         """Get a tool by name.
@@ -49,7 +39,12 @@ class ToolRegistry:
         Returns:
             Tool callable or None if not found
         """
-        return self.tools.get(tool_name)
+        if tool_name not in self._factories:
+            return None
+        with self._instances_lock:
+            if tool_name not in self._instances:
+                self._instances[tool_name] = self._factories[tool_name]()
+            return self._instances[tool_name]
     
     def list_tools(self) -> Dict[str, str]:
         """List all available tools with descriptions.
@@ -75,7 +70,7 @@ class ToolRegistry:
         """
         tool = self.get_tool(tool_name)
         if not tool:
-            return f"Tool '{tool_name}' not found. Available tools: {', '.join(self.tools.keys())}"
+            return f"Tool '{tool_name}' not found. Available tools: {', '.join(self._factories.keys())}"
         
         try:
             if tool_name == "web_search":
@@ -85,23 +80,59 @@ class ToolRegistry:
                     return "Error: No search query provided. Please provide a valid search query."
                 return tool(query)
             elif tool_name == "finance":
-                action = kwargs.get("action", "stock_info")
-                symbol = kwargs.get("symbol")
-                # Remove action and symbol from kwargs to avoid duplicate arguments
-                kwargs_clean = {k: v for k, v in kwargs.items() if k not in ["action", "symbol"]}
-                return tool(action, symbol, **kwargs_clean)
+                # kwargs is local to this call, so pop positional args in place
+                action = kwargs.pop("action", "stock_info")
+                symbol = kwargs.pop("symbol", None)
+                return tool(action, symbol, **kwargs)
             elif tool_name == "gdp":
-                action = kwargs.get("action", "gdp")
-                country = kwargs.get("country", "US")
-                # Remove action and country from kwargs to avoid duplicate arguments
-                kwargs_clean = {k: v for k, v in kwargs.items() if k not in ["country", "action"]}
-                return tool(action, country=country, **kwargs_clean)
+                action = kwargs.pop("action", "gdp")
+                country = kwargs.pop("country", "US")
+                return tool(action, country=country, **kwargs)
             else:
                 return f"Tool '{tool_name}' execution not implemented"
         except Exception as e:
             logger.error(f"Error executing tool {tool_name}: {str(e)}")
             return f"Error executing tool: {str(e)}"
+    
+    def close(self):
+        """Release tool resources (e.g. HTTP connection pools)."""
+        with self._instances_lock:
+            for tool in self._instances.values():
+                close = getattr(tool, "close", None)
+                if callable(close):
+                    close()
+
+
+def _create_web_search_tool() -> Callable:
+    """Create the web search tool (Tavily recommended for RAG)."""
+    from app.tools.web_search import WebSearchTool
+    
+    web_search_key = os.getenv("TAVILY_API_KEY") or os.getenv("SERPAPI_API_KEY") or os.getenv("WEB_SEARCH_API_KEY")
+    web_search_provider = os.getenv("WEB_SEARCH_PROVIDER", "tavily")
+    tool = WebSearchTool(api_key=web_search_key, provider=web_search_provider)
+    logger.info(f"Initialized web_search tool with provider: {web_search_provider}")
+    return tool
+
+
+def _create_finance_tool() -> Callable:
+    """Create the finance tool."""
+    from app.tools.finance_tool import FinanceTool
+    
+    tool = FinanceTool()
+    logger.info("Initialized finance tool")
+    return tool
+
+
+def _create_gdp_tool() -> Callable:
+    """Create the GDP tool."""
+    from app.tools.gdp_tool import GDPTool
+    
+    gdp_api_key = os.getenv("FRED_API_KEY") or os.getenv("GDP_API_KEY")
+    tool = GDPTool(api_key=gdp_api_key)
+    logger.info("Initialized gdp tool")
+    return tool
 
 
 # Global tool registry instance
 tool_registry = ToolRegistry()
+atexit.register(tool_registry.close)
@@ -1,10 +1,96 @@
 """Web search tool using Tavily, DuckDuckGo, or SerpAPI."""
 
+import atexit
+import copy
+import importlib.util
 import logging
-from typing import Optional, List, Dict
+import re
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from itertools import islice
+from typing import Optional, List, Dict, Any, Tuple
+import httpx
+import orjson
+from cachetools import TTLCache
+
+from app.tools.httpx_caching_transport import CachingTransport, proxy_configured
+
+__all__ = ["WebSearchTool"]
 
 logger = logging.getLogger(__name__)
 
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+SERPAPI_SEARCH_URL = "https://serpapi.com/search"
+
+# DuckDuckGo rate-limits aggressively; retry a few times with exponential backoff
+DDG_MAX_ATTEMPTS = 3
+DDG_BACKOFF_SECONDS = 1.0
+
+_WS_RE = re.compile(r"\s+")
+_TERMINATORS = frozenset(".!?")
+
+# Live tools, so their connection pools can be released at interpreter exit
+_open_tools: "weakref.WeakSet[WebSearchTool]" = weakref.WeakSet()
+
+
+def _lazy_module(name: str):
+    """Register a module whose body only executes on first attribute access.
+    
+    Returns None if the module is not installed.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# duckduckgo_search pulls in a heavy HTTP stack; its import is deferred and
+# warmed up in the background once a DuckDuckGo-backed tool is created
+_ddgs_module = _lazy_module("duckduckgo_search")
+_ddgs_warmup: Optional[threading.Thread] = None
+_ddgs_warmup_lock = threading.Lock()
+
+
+def _import_ddgs():
+    """Touch the lazy module so its body executes."""
+    try:
+        _ddgs_module.DDGS
+    except Exception as e:
+        logger.warning(f"Background import of duckduckgo_search failed: {str(e)}")
+
+
+def _warm_up_ddgs():
+    """Start importing duckduckgo_search on a background thread (once)."""
+    global _ddgs_warmup
+    if _ddgs_module is None:
+        return
+    with _ddgs_warmup_lock:
+        if _ddgs_warmup is None:
+            _ddgs_warmup = threading.Thread(
+                target=_import_ddgs,
+                name="ddgs-warmup",
+                daemon=True
+            )
+            _ddgs_warmup.start()
+
+
+def _wait_for_ddgs_warmup():
+    """Block until any background import has finished."""
+    with _ddgs_warmup_lock:
+        warmup = _ddgs_warmup
+    if warmup is not None:
+        warmup.join()
+
 
 class WebSearchTool:
     """Web search tool for real-time information retrieval."""
@@ -19,6 +105,67 @@ class WebSearchTool:
         self.api_key = api_key
         self.provider = provider.lower()
         self._search_engine = None
+        # Shared keep-alive pool so repeated searches skip the TCP/TLS handshake
+        limits = httpx.Limits(max_keepalive_connections=20, max_connections=40)
+        if proxy_configured():
+            # Let httpx mount the environment's proxies; the proxy resolves hosts itself
+            self._http = httpx.Client(timeout=15.0, limits=limits)
+        else:
+            self._http = httpx.Client(
+                timeout=15.0,
+                transport=CachingTransport(limits=limits)
+            )
+        _open_tools.add(self)
+        # Recent results keyed by (provider, normalized query, max_results)
+        self._cache: TTLCache = TTLCache(maxsize=512, ttl=300)
+        self._formatted_cache: TTLCache = TTLCache(maxsize=512, ttl=300)
+        if self.provider == "duckduckgo" or not self.api_key:
+            _warm_up_ddgs()
+        self._cache_lock = threading.Lock()
+        # Searches currently running, so identical concurrent queries share one request
+        self._inflight: Dict[Tuple[str, str, int], Future] = {}
+        self._inflight_lock = threading.Lock()
+    
+    def _cache_key(self, query: str, max_results: int) -> Tuple[str, str, int]:
+        """Build the result-cache key for a query."""
+        return (self.provider, query.strip().lower(), max_results)
+    
+    def clear_cache(self):
+        """Drop all cached search results."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._formatted_cache.clear()
+    
+    def close(self):
+        """Release pooled HTTP connections."""
+        http = getattr(self, "_http", None)
+        if http is not None and not http.is_closed:
+            http.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def _tavily_search(self, query: str, **params: Any) -> Dict[str, Any]:
+        """Call the Tavily search API over the pooled client.
+        
+        The key is sent once, as a Bearer token (Tavily's current auth scheme).
+        """
+        response = self._http.post(
+            TAVILY_SEARCH_URL,
+            json={"query": query, **params},
+            headers={"Authorization": f"Bearer {self.api_key}"}
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    def _serpapi_search(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the SerpAPI Google search endpoint over the pooled client."""
+        response = self._http.get(SERPAPI_SEARCH_URL, params={"engine": "google", **params})
+        response.raise_for_status()
+        return orjson.loads(response.content)
     
     def _get_search_engine(self):
         """Lazy load search engine."""
@@ -28,29 +175,22 @@ class WebSearchTool:
                     logger.warning("Tavily API key not provided, falling back to DuckDuckGo")
                     self.provider = "duckduckgo"
                 else:
-                    try:
-                        from tavily import TavilyClient
-                        self._search_engine = TavilyClient(api_key=self.api_key)
-                        logger.info("Using Tavily for web search")
-                        return self._search_engine
-                    except ImportError:
-                        logger.warning("tavily-python not installed, falling back to DuckDuckGo")
-                        self.provider = "duckduckgo"
+                    self._search_engine = self._tavily_search
+                    logger.info("Using Tavily for web search")
+                    return self._search_engine
             
             if self.provider == "serpapi" and self.api_key:
-                try:
-                    from serpapi import GoogleSearch
-                    self._search_engine = GoogleSearch
-                    logger.info("Using SerpAPI for web search")
-                    return self._search_engine
-                except ImportError:
-                    logger.warning("serpapi not installed, falling back to DuckDuckGo")
-                    self.provider = "duckduckgo"
+                self._search_engine = self._serpapi_search
+                logger.info("Using SerpAPI for web search")
+                return self._search_engine
             
             if self.provider == "duckduckgo":
                 try:
-                    from duckduckgo_search import DDGS
-                    self._search_engine = DDGS()
+                    if _ddgs_module is None:
+                        raise ImportError("duckduckgo_search")
+                    # The lazy module must not be executed from two threads at once
+                    _wait_for_ddgs_warmup()
+                    self._search_engine = _ddgs_module.DDGS()
                     logger.info("Using DuckDuckGo for web search")
                     return self._search_engine
                 except ImportError:
@@ -71,12 +211,54 @@ class WebSearchTool:
         Returns:
             List of search results with title, snippet, and url
         """
+        # Validate query
+        if not query or not query.strip():
+            logger.error("Empty query provided to web search")
+            return []
+        
+        key = self._cache_key(query, max_results)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            logger.debug(f"Web search cache hit for query: '{query[:50]}'")
+            return copy.deepcopy(cached)
+        
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+        
+        if not is_leader:
+            logger.debug(f"Joining in-flight web search for query: '{query[:50]}'")
+            return copy.deepcopy(future.result())
+        
         try:
-            # Validate query
-            if not query or not query.strip():
-                logger.error("Empty query provided to web search")
-                return []
+            results = self._search_provider(query, max_results)
+            if results:
+                with self._cache_lock:
+                    self._cache[key] = copy.deepcopy(results)
+            future.set_result(results)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+        return copy.deepcopy(results)
+    
+    def _search_provider(self, query: str, max_results: int) -> List[Dict[str, str]]:
+        """Run a search against the configured provider (uncached).
+        
+        Args:
+            query: Search query
+            max_results: Maximum number of results to return
             
+        Returns:
+            List of search results with title, snippet, and url
+        """
+        try:
             engine = self._get_search_engine()
             
             if engine is None:
@@ -84,11 +266,11 @@ class WebSearchTool:
                 return []
             
             if self.provider == "tavily":
-                # Tavily search - query must be first positional argument
+                # Tavily search over the pooled HTTP client
                 logger.debug(f"Searching Tavily with query: '{query[:50]}...' (truncated)")
                 # Use include_answer for better results, and include_raw_content for snippets
-                response = engine.search(
-                    query, 
+                response = engine(
+                    query,
                     max_results=max_results,
                     include_answer=True,  # Get AI-generated answer
                     include_raw_content="text",  # Include text content
@@ -131,7 +313,7 @@ class WebSearchTool:
                 
                 return results
             elif self.provider == "serpapi":
-                # SerpAPI search
+                # SerpAPI Google search over the pooled HTTP client
                 search = engine({"q": query, "api_key": self.api_key})
                 results = []
                 for result in search.get("organic_results", [])[:max_results]:
@@ -143,23 +325,68 @@ class WebSearchTool:
                 return results
             else:  # duckduckgo
                 # DuckDuckGo search
-                results = []
                 if hasattr(engine, 'text'):
-                    for result in engine.text(query, max_results=max_results):
-                        if result:  # Check if result is not None
-                            results.append({
-                                "title": result.get("title", ""),
-                                "snippet": result.get("body", ""),
-                                "url": result.get("href", "")
-                            })
-                else:
-                    logger.error("DuckDuckGo engine does not have 'text' method")
-                return results
+                    return self._duckduckgo_search(engine, query, max_results)
+                logger.error("DuckDuckGo engine does not have 'text' method")
+                return []
                 
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if status in (401, 403) and self.provider in ("tavily", "serpapi"):
+                # Missing or invalid key: degrade to DuckDuckGo instead of failing
+                logger.warning(
+                    f"{self.provider} rejected the API key (HTTP {status}), "
+                    "falling back to DuckDuckGo"
+                )
+                self.provider = "duckduckgo"
+                self._search_engine = None
+                return self._search_provider(query, max_results)
+            logger.error(f"Error in web search: {str(e)}", exc_info=True)
+            return []
         except Exception as e:
             logger.error(f"Error in web search: {str(e)}", exc_info=True)
             return []
     
+    def _duckduckgo_search(self, engine, query: str, max_results: int) -> List[Dict[str, str]]:
+        """Run a DuckDuckGo text search, retrying with backoff on failures.
+        
+        Args:
+            engine: DDGS instance
+            query: Search query
+            max_results: Maximum number of results to return
+            
+        Returns:
+            List of search results with title, snippet, and url
+        """
+        for attempt in range(DDG_MAX_ATTEMPTS):
+            try:
+                results = []
+                # islice stops consuming the generator as soon as enough results arrive
+                for result in islice(
+                    engine.text(
+                        query,
+                        region="wt-wt",
+                        safesearch="moderate",
+                        backend="api",
+                        max_results=max_results
+                    ),
+                    max_results
+                ):
+                    if result:  # Check if result is not None
+                        results.append({
+                            "title": result.get("title", ""),
+                            "snippet": result.get("body", ""),
+                            "url": result.get("href", "")
+                        })
+                return results
+            except Exception as e:
+                if attempt == DDG_MAX_ATTEMPTS - 1:
+                    raise
+                delay = DDG_BACKOFF_SECONDS * (2 ** attempt)
+                logger.warning(f"DuckDuckGo search failed ({str(e)}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+        return []
+    
     def _clean_content(self, content: str, max_length: int = 500) -> str:
         """Clean and truncate content.
         
@@ -173,21 +400,19 @@ class WebSearchTool:
         if not content:
             return ""
         
-        # Remove excessive whitespace
-        content = " ".join(content.split())
-        
-        # Remove common noise patterns
-        content = content.replace("\n\n\n", "\n\n")
-        content = content.replace("  ", " ")
+        # Collapse all whitespace runs (including newlines) to single spaces
+        content = _WS_RE.sub(" ", content).strip()
         
         # Truncate intelligently (at sentence boundary if possible)
         if len(content) > max_length:
             truncated = content[:max_length]
-            # Try to cut at sentence boundary
-            last_period = truncated.rfind(". ")
-            last_exclamation = truncated.rfind("! ")
-            last_question = truncated.rfind("? ")
-            last_break = max(last_period, last_exclamation, last_question)
+            # Scan right-to-left for the last sentence boundary; whitespace is
+            # already collapsed, so a boundary is a terminator followed by " "
+            last_break = -1
+            for i in range(len(truncated) - 1, 0, -1):
+                if truncated[i] == " " and truncated[i - 1] in _TERMINATORS:
+                    last_break = i - 1
+                    break
             
             if last_break > max_length * 0.7:  # Only use if not too short
                 content = truncated[:last_break + 1] + "..."
@@ -205,34 +430,53 @@ class WebSearchTool:
         Returns:
             Formatted search results as string
         """
+        key = self._cache_key(query, 5) if query and query.strip() else None
+        if key is not None:
+            with self._cache_lock:
+                cached = self._formatted_cache.get(key)
+            if cached is not None:
+                return cached
+        
         results = self.search(query)
         if not results:
             return "No search results found."
         
-        formatted = ""
-        
-        # Separate answer/summary from individual results
-        answer_results = [r for r in results if r.get("is_answer", False)]
-        regular_results = [r for r in results if not r.get("is_answer", False)]
+        # Single pass: keep the first answer/summary, collect source lines as we go
+        answer = None
+        source_lines: List[str] = []
+        idx = 0
+        for result in results:
+            if result.get("is_answer", False):
+                if answer is None:
+                    answer = result
+                continue
+            idx += 1
+            title = result.get('title', 'Untitled')
+            snippet = result.get('snippet', '')
+            url = result.get('url', '')
+            
+            source_lines.append(f"{idx}. **{title}**")
+            if snippet:
+                source_lines.append(f"   {snippet}")
+            if url:
+                source_lines.append(f"   🔗 {url}")
+            source_lines.append("")
         
-        # Add answer/summary first if available
-        if answer_results:
-            answer = answer_results[0]
-            formatted += f"**Summary:**\n{answer['snippet']}\n\n"
+        parts: List[str] = []
+        if answer is not None:
+            parts.extend(["**Summary:**", answer['snippet'], ""])
+        if source_lines:
+            parts.extend(["**Sources:**", ""])
+            parts.extend(source_lines)
+        formatted = "\n".join(parts).strip()
         
-        # Add individual results
-        if regular_results:
-            formatted += "**Sources:**\n\n"
-            for i, result in enumerate(regular_results, 1):
-                title = result.get('title', 'Untitled')
-                snippet = result.get('snippet', '')
-                url = result.get('url', '')
-                
-                formatted += f"{i}. **{title}**\n"
-                if snippet:
-                    formatted += f"   {snippet}\n"
-                if url:
-                    formatted += f"   🔗 {url}\n"
-                formatted += "\n"
-        
-        return formatted.strip()
+        with self._cache_lock:
+            self._formatted_cache[key] = formatted
+        return formatted
+
+
+@atexit.register
+def _close_open_tools():
+    """Close pooled connections of any tools still alive at exit."""
+    for tool in list(_open_tools):
+        tool.close()
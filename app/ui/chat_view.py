@@ -1,7 +1,62 @@
 """Chat view component for document Q&A."""
 
+import math
 import streamlit as st
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+
+
+def _format_duration(seconds: float) -> str:
+    """Format an execution time for display."""
+    return f"{seconds:.2f}s" if seconds < 60 else f"{seconds/60:.1f}m"
+
+
+def _format_relevance(relevance) -> Optional[str]:
+    """Format a relevance score with 3 decimals, or None if the chunk is unscored.
+    
+    Citations carry the score as a preformatted string or a float; a missing
+    or NaN score means the re-ranker did not score the chunk.
+    """
+    if relevance is None:
+        return None
+    try:
+        value = float(relevance)
+    except (TypeError, ValueError):
+        return str(relevance)
+    if math.isnan(value):
+        return None
+    return f"{value:.3f}"
+
+
+def _citations_key(citations: List[Dict]) -> Tuple:
+    """Build a hashable cache key from a message's citations."""
+    return tuple(
+        (
+            c.get('chunk_id', 'N/A'),
+            c.get('page', 'N/A'),
+            c.get('section', 'N/A'),
+            c.get('relevance_score'),
+            c.get('preview', '')[:200],
+        )
+        for c in citations
+    )
+
+
+@st.cache_data(max_entries=256)
+def _format_citations(citations_key: Tuple) -> List[Tuple[str, str, str]]:
+    """Format citations as (header, caption, preview) triples for rendering.
+    
+    Keyed on the citation content only, so identical citations shared by
+    several messages (or sessions) reuse one entry.
+    """
+    formatted = []
+    for chunk_id, page, section, relevance, preview in citations_key:
+        caption = f"Page: {page} | Section: {section}"
+        relevance = _format_relevance(relevance)
+        # Unscored chunks (no or NaN relevance_score) show no relevance
+        if relevance is not None:
+            caption += f" | Relevance: {relevance}"
+        formatted.append((f"**Chunk {chunk_id}**", caption, preview + "..."))
+    return formatted
 
 
 def render_chat_interface():
@@ -21,39 +76,47 @@ def render_chat_interface():
     # Chat messages container
     chat_container = st.container()
     
+    # Messages are stored with every key populated (see add_*_message)
+    messages = st.session_state.chat_messages
+    # Bind Streamlit calls to locals to skip repeated module attribute lookups in the loop
+    _chat_message = st.chat_message
+    _write = st.write
+    _caption = st.caption
+    _markdown = st.markdown
+    _expander = st.expander
+    _text = st.text
+    
     with chat_container:
-        for message in st.session_state.chat_messages:
-            role = message.get('role', 'user')
-            content = message.get('content', '')
-            citations = message.get('citations', [])
+        for message in messages:
+            role = message['role']
+            content = message['content']
+            citations = message['citations']
             
             if role == 'user':
-                with st.chat_message("user"):
-                    st.write(content)
+                with _chat_message("user"):
+                    _write(content)
             else:
-                with st.chat_message("assistant"):
-                    st.write(content)
+                with _chat_message("assistant"):
+                    _write(content)
                     
                     # Display execution time
-                    execution_time = message.get('execution_time')
-                    if execution_time is not None:
-                        time_str = f"{execution_time:.2f}s" if execution_time < 60 else f"{execution_time/60:.1f}m"
-                        st.caption(f"⏱️ Response time: {time_str}")
+                    time_str = message['_time_str']
+                    if time_str is not None:
+                        _caption(f"⏱️ Response time: {time_str}")
                     
                     # Display tool used if available
-                    tool_used = message.get('tool_used')
+                    tool_used = message['tool_used']
                     if tool_used:
-                        st.caption(f"🔧 Used tool: {tool_used}")
+                        _caption(f"🔧 Used tool: {tool_used}")
                     
                     # Display citations if available
                     if citations:
-                        with st.expander(f"📚 Citations ({len(citations)})"):
-                            for citation in citations:
-                                st.markdown(f"**Chunk {citation.get('chunk_id', 'N/A')}**")
-                                st.caption(f"Page: {citation.get('page', 'N/A')} | "
-                                          f"Section: {citation.get('section', 'N/A')} | "
-                                          f"Relevance: {citation.get('relevance_score', 'N/A')}")
-                                st.text(citation.get('preview', '')[:200] + "...")
+                        formatted = _format_citations(_citations_key(citations))
+                        with _expander(message['_citation_header']):
+                            for header, caption, preview in formatted:
+                                _markdown(header)
+                                _caption(caption)
+                                _text(preview)
     
     # Chat input
     st.markdown("---")
@@ -81,7 +144,12 @@ def add_user_message(query: str):
     
     st.session_state.chat_messages.append({
         'role': 'user',
-        'content': query
+        'content': query,
+        'citations': [],
+        'tool_used': None,
+        'execution_time': None,
+        '_time_str': None,
+        '_citation_header': None
     })
 
 
@@ -102,5 +170,8 @@ def add_assistant_message(answer: str, citations: List[Dict] = None, tool_used:
         'content': answer,
         'citations': citations or [],
         'tool_used': tool_used,
-        'execution_time': execution_time
+        'execution_time': execution_time,
+        # Display strings are computed once here rather than on every rerun
+        '_time_str': _format_duration(execution_time) if execution_time is not None else None,
+        '_citation_header': f"📚 Citations ({len(citations or [])})"
     })
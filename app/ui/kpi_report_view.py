@@ -1,8 +1,49 @@
 """KPI Report view component."""
 
 import streamlit as st
+import xxhash
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
 from app.utils.export import ReportExporter
 
+# Shared exporter, created on the first export request
+_exporter: Optional[ReportExporter] = None
+
+# Exported files kept per session (markdown + PDF for the last couple of reports)
+_EXPORT_CACHE_SIZE = 4
+
+
+def _get_exporter() -> ReportExporter:
+    """Return the module-level ReportExporter, creating it on first use."""
+    global _exporter
+    if _exporter is None:
+        _exporter = ReportExporter()
+    return _exporter
+
+
+def _cached_export(kind: str, report: str, build: Callable[[str], Tuple[bytes, str]]) -> Tuple[bytes, str]:
+    """Return exported (file_bytes, filename), reusing this session's cached copy.
+    
+    Args:
+        kind: Export format ('markdown' or 'pdf')
+        report: Markdown report content
+        build: Exporter function producing (file_bytes, filename)
+    """
+    if 'export_cache' not in st.session_state:
+        st.session_state.export_cache = OrderedDict()
+    cache = st.session_state.export_cache
+    
+    key = (kind, xxhash.xxh64_hexdigest(report))
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    
+    result = build(report)
+    cache[key] = result
+    while len(cache) > _EXPORT_CACHE_SIZE:
+        cache.popitem(last=False)
+    return result
+
 
 def render_kpi_report(report: str, kpi_data: dict, execution_time: float = None):
     """Render KPI report view.
@@ -31,8 +72,8 @@ def render_kpi_report(report: str, kpi_data: dict, execution_time: float = None)
     
     with col1:
         if st.button("Download as Markdown", use_container_width=True):
-            exporter = ReportExporter()
-            file_bytes, filename = exporter.export_markdown(report)
+            exporter = _get_exporter()
+            file_bytes, filename = _cached_export("markdown", report, exporter.export_markdown)
             st.download_button(
                 label="⬇️ Download Markdown",
                 data=file_bytes,
@@ -44,8 +85,8 @@ def render_kpi_report(report: str, kpi_data: dict, execution_time: float = None)
     with col2:
         if st.button("Download as PDF", use_container_width=True):
             try:
-                exporter = ReportExporter()
-                file_bytes, filename = exporter.export_pdf(report)
+                exporter = _get_exporter()
+                file_bytes, filename = _cached_export("pdf", report, exporter.export_pdf)
                 st.download_button(
                     label="⬇️ Download PDF",
                     data=file_bytes,
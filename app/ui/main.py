@@ -1,18 +1,30 @@
 """Main Streamlit UI application."""
 
 import streamlit as st
-import hashlib
 from pathlib import Path
+from typing import BinaryIO
 import logging
+import shutil
+import tempfile
+import threading
+import xxhash
+from cachetools import LRUCache
 
 from app.ingestion.pipeline import IngestionPipeline
+from app.ingestion.vector_store import FAISSVectorStore
 from app.agents.orchestrator import AgentOrchestrator
+from app.utils.context_manager import ContextManager
 from app.ui.components import show_progress, clear_progress, show_status, styled_button
 from app.ui.kpi_report_view import render_kpi_report
 from app.ui.chat_view import render_chat_interface, add_user_message, add_assistant_message
 
 logger = logging.getLogger(__name__)
 
+# Read uploads in 1 MiB chunks when hashing
+HASH_CHUNK_SIZE = 1 << 20
+# Spooled uploads stay in memory up to this size, then roll over to disk
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
 # Page configuration
 st.set_page_config(
     page_title="BFSI Document Intelligence",
@@ -21,8 +33,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+
+@st.cache_data
+def _inject_css() -> str:
+    """Return the custom CSS block, built once per server process."""
+    return """
     <style>
     .main-header {
         font-size: 2.5rem;
@@ -36,13 +51,65 @@ st.markdown("""
         margin-bottom: 2rem;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+
+# Custom CSS
+st.markdown(_inject_css(), unsafe_allow_html=True)
 
 
-def get_document_id(file_name: str, file_content: bytes) -> str:
-    """Generate unique document ID from file."""
-    content_hash = hashlib.md5(file_content).hexdigest()
-    return f"{Path(file_name).stem}_{content_hash[:8]}"
+def hash_upload(uploaded_file: BinaryIO) -> str:
+    """Derive a document ID from an upload's content, without copying it.
+    
+    The ID is not security-sensitive, so the content is hashed with xxh3
+    in fixed-size chunks rather than MD5 over one big buffer.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile (or any named binary stream)
+        
+    Returns:
+        Document ID of the form "<stem>_<8 hex chars>"
+    """
+    hasher = xxhash.xxh3_128()
+    if hasattr(uploaded_file, "getbuffer"):
+        # UploadedFile is a BytesIO: slice its buffer zero-copy instead of read()
+        with uploaded_file.getbuffer() as buf:
+            for start in range(0, len(buf), HASH_CHUNK_SIZE):
+                with buf[start:start + HASH_CHUNK_SIZE] as chunk:
+                    hasher.update(chunk)
+    else:
+        uploaded_file.seek(0)
+        while chunk := uploaded_file.read(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+        uploaded_file.seek(0)
+    return f"{Path(uploaded_file.name).stem}_{hasher.hexdigest()[:8]}"
+
+
+def spool_upload(uploaded_file: BinaryIO) -> BinaryIO:
+    """Copy an upload to a spooled temp file for ingestion.
+    
+    The spool keeps small files in memory and rolls larger ones to disk, so
+    the upload is never duplicated as a second full bytes object. Only call
+    this when the document is actually about to be ingested.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile (or any named binary stream)
+        
+    Returns:
+        Spool rewound to the start
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    if hasattr(uploaded_file, "getbuffer"):
+        with uploaded_file.getbuffer() as buf:
+            for start in range(0, len(buf), HASH_CHUNK_SIZE):
+                with buf[start:start + HASH_CHUNK_SIZE] as chunk:
+                    spool.write(chunk)
+    else:
+        uploaded_file.seek(0)
+        shutil.copyfileobj(uploaded_file, spool, HASH_CHUNK_SIZE)
+        uploaded_file.seek(0)
+    spool.seek(0)
+    return spool
 
 
 def progress_callback(message: str, progress: float):
@@ -50,6 +117,75 @@ def progress_callback(message: str, progress: float):
     show_progress(message, progress)
 
 
+@st.cache_resource
+def _vector_store_cache() -> LRUCache:
+    """Process-wide LRU of ingested vector stores, keyed by document ID.
+    
+    Only the finished stores are cached; ingestion itself (and its progress
+    UI) runs in the caller, since Streamlit does not replay UI elements drawn
+    inside cache_resource functions.
+    """
+    return LRUCache(maxsize=4)
+
+
+# Guards _vector_store_cache(), which every session shares
+_vector_store_lock = threading.Lock()
+
+
+def _ingest_cached(doc_id: str, file_name: str, uploaded_file: BinaryIO) -> FAISSVectorStore:
+    """Ingest a document once per document ID for the whole server process.
+    
+    Repeat uploads of the same content reuse the cached vector store; the
+    upload is only spooled on a miss that actually runs the pipeline.
+    
+    Args:
+        doc_id: Document identifier derived from the content hash
+        file_name: Original upload file name (used for the file extension)
+        uploaded_file: Uploaded file with the document content
+        
+    Returns:
+        FAISSVectorStore with the document indexed
+    """
+    cache = _vector_store_cache()
+    with _vector_store_lock:
+        vector_store = cache.get(doc_id)
+    if vector_store is not None:
+        return vector_store
+    
+    # Stores persisted by an earlier run (e.g. before a pod restart) skip the pipeline
+    vector_store = ContextManager().load_vector_store(doc_id)
+    if vector_store is None:
+        # The pipeline saves the store under doc_id, so the next cold start finds it
+        pipeline = IngestionPipeline(progress_callback=progress_callback)
+        vector_store = pipeline.ingest(
+            file_path=file_name,
+            file_content=spool_upload(uploaded_file),
+            document_id=doc_id
+        )
+    
+    with _vector_store_lock:
+        cache[doc_id] = vector_store
+    return vector_store
+
+
+@st.cache_resource(ttl=3600, max_entries=4, show_spinner=False)
+def _get_orchestrator(doc_id: str, _vector_store: FAISSVectorStore) -> AgentOrchestrator:
+    """Build the agent orchestrator once per document ID.
+    
+    The orchestrator only holds the vector store and lazily built graphs, so
+    it can be shared across sessions; the underscore keeps Streamlit from
+    hashing the vector store.
+    
+    Args:
+        doc_id: Document identifier the vector store was built for
+        _vector_store: Vector store backing the orchestrator
+        
+    Returns:
+        AgentOrchestrator instance
+    """
+    return AgentOrchestrator(_vector_store)
+
+
 def initialize_session_state():
     """Initialize Streamlit session state variables.
     
@@ -143,9 +279,9 @@ def main():
         )
         
         if uploaded_file is not None:
-            # Check if this is a new document
-            file_content = uploaded_file.read()
-            doc_id = get_document_id(uploaded_file.name, file_content)
+            # Check if this is a new document (hashing is zero-copy; the
+            # upload is only spooled when it is actually ingested)
+            doc_id = hash_upload(uploaded_file)
             
             # Check if document already ingested
             if st.session_state.document_id != doc_id:
@@ -166,16 +302,10 @@ def main():
                         status_placeholder = st.empty()
                         status_placeholder.info("🔄 Starting ingestion... This may take a few minutes for large documents.")
                         
-                        # Initialize pipeline
-                        pipeline = IngestionPipeline(progress_callback=progress_callback)
-                        
-                        # Ingest document with better error handling
+                        # Ingest document with better error handling; repeat uploads of
+                        # the same content reuse the cached vector store
                         try:
-                            vector_store = pipeline.ingest(
-                                file_path=uploaded_file.name,
-                                file_content=file_content,
-                                document_id=doc_id
-                            )
+                            vector_store = _ingest_cached(doc_id, uploaded_file.name, uploaded_file)
                         except MemoryError:
                             clear_progress()
                             status_placeholder.error("❌ Out of memory during ingestion. The document may be too large. Try a smaller document or increase pod memory limits.")
@@ -193,8 +323,7 @@ def main():
                         
                         # Initialize orchestrator
                         try:
-                            orchestrator = AgentOrchestrator(vector_store)
-                            st.session_state.orchestrator = orchestrator
+                            st.session_state.orchestrator = _get_orchestrator(doc_id, vector_store)
                         except Exception as orch_error:
                             clear_progress()
                             status_placeholder.error(f"❌ Failed to initialize orchestrator: {str(orch_error)}")
@@ -267,55 +396,72 @@ def main():
     # Display KPI Report if available
     if st.session_state.kpi_report:
         st.markdown("---")
-        render_kpi_report(
-            st.session_state.kpi_report,
-            st.session_state.kpi_data or {},
-            st.session_state.get('kpi_execution_time')
-        )
+        _kpi_fragment()
     
     # Display Chat interface if selected
     if st.session_state.get('current_view') == "chat" or chat_doc:
         st.markdown("---")
-        query = render_chat_interface()
+        _chat_fragment()
+
+
+@st.fragment
+def _kpi_fragment():
+    """Render the KPI report; its widgets rerun only this fragment."""
+    render_kpi_report(
+        st.session_state.kpi_report,
+        st.session_state.kpi_data or {},
+        st.session_state.get('kpi_execution_time')
+    )
+
+
+@st.fragment
+def _chat_fragment():
+    """Render the chat interface and answer queries.
+    
+    Sending a message reruns only this fragment, not the header, sidebar
+    and KPI report around it.
+    """
+    query = render_chat_interface()
+    
+    if query:
+        if st.session_state.orchestrator is None:
+            show_status("❌ Orchestrator not initialized", "error")
+            return
         
-        if query:
-            if st.session_state.orchestrator is None:
-                show_status("❌ Orchestrator not initialized", "error")
-                return
-            
-            # Add user message
-            add_user_message(query)
-            
-            try:
-                with st.spinner("Thinking..."):
-                    # Get chat history
-                    chat_history = st.session_state.get('chat_history', [])
-                    
-                    # Execute chat flow
-                    result = st.session_state.orchestrator.execute(
-                        "chat",
-                        query=query,
-                        chat_history=chat_history
-                    )
-                    
-                    answer = result.get("answer", "Not available in the document.")
-                    citations = result.get("citations", [])
-                    tool_used = result.get("tool_used")
-                    execution_time = result.get("execution_time")
-                    updated_history = result.get("chat_history", [])
-                    
-                    # Update session state
-                    st.session_state.chat_history = updated_history
-                    
-                    # Add assistant message with execution time
-                    add_assistant_message(answer, citations, tool_used, execution_time)
-                    
-                    st.rerun()
-                    
-            except Exception as e:
-                show_status(f"❌ Error generating answer: {str(e)}", "error")
-                logger.error(f"Chat error: {str(e)}", exc_info=True)
-                add_assistant_message("Sorry, I encountered an error. Please try again.")
+        # Add user message
+        add_user_message(query)
+        
+        try:
+            with st.spinner("Thinking..."):
+                # Get chat history
+                chat_history = st.session_state.get('chat_history', [])
+                
+                # Execute chat flow
+                result = st.session_state.orchestrator.execute(
+                    "chat",
+                    query=query,
+                    chat_history=chat_history
+                )
+                
+                answer = result.get("answer", "Not available in the document.")
+                citations = result.get("citations", [])
+                tool_used = result.get("tool_used")
+                execution_time = result.get("execution_time")
+                updated_history = result.get("chat_history", [])
+                
+                # Update session state
+                st.session_state.chat_history = updated_history
+                
+                # Add assistant message with execution time
+                add_assistant_message(answer, citations, tool_used, execution_time)
+                
+                # Only the chat fragment needs to redraw with the new messages
+                st.rerun(scope="fragment")
+                
+        except Exception as e:
+            show_status(f"❌ Error generating answer: {str(e)}", "error")
+            logger.error(f"Chat error: {str(e)}", exc_info=True)
+            add_assistant_message("Sorry, I encountered an error. Please try again.")
 
 
 if __name__ == "__main__":
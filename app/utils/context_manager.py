@@ -2,13 +2,41 @@
 
 import logging
 import json
-import pickle
 from pathlib import Path
 from typing import Optional, Dict, Any
+import msgpack
 import streamlit as st
 
+from app.config.settings import config
+from app.ingestion.vector_store import FAISSVectorStore
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Values of these exact types are stored as-is; subclasses fall back to isinstance
+_JSON_TYPES = (dict, list, str, int, float, bool, type(None))
+_JSON_TYPE_SET = frozenset(_JSON_TYPES)
+# Live objects kept in session_state only; never written to disk
+_SKIP_KEYS = frozenset({'vector_store', 'orchestrator'})
+
+
+def _msgpack_default(obj: Any) -> Any:
+    """Convert values msgpack cannot encode natively (e.g. numpy scalars/arrays)."""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    return str(obj)
+
+
+def _loads_json(data: bytes) -> Any:
+    """Deserialize legacy JSON context bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class ContextManager:
     """Manages application context and state persistence."""
@@ -30,21 +58,22 @@ class ContextManager:
             context: Context dictionary to save
         """
         try:
-            context_file = self.base_path / f"{document_id}_context.json"
+            context_file = self.base_path / f"{document_id}_context.msgpack"
             
             # Convert non-serializable objects to metadata
             serializable_context = {}
             for key, value in context.items():
-                if key in ['vector_store', 'orchestrator']:
+                if key in _SKIP_KEYS:
                     # Skip non-serializable objects, they're in session_state
                     continue
-                elif isinstance(value, (dict, list, str, int, float, bool, type(None))):
+                elif type(value) in _JSON_TYPE_SET or isinstance(value, _JSON_TYPES):
                     serializable_context[key] = value
                 else:
                     serializable_context[key] = str(value)
             
-            with open(context_file, 'w') as f:
-                json.dump(serializable_context, f, indent=2)
+            context_file.write_bytes(
+                msgpack.packb(serializable_context, use_bin_type=True, default=_msgpack_default)
+            )
             
             logger.info(f"Saved context for document: {document_id}")
         except Exception as e:
@@ -60,16 +89,52 @@ class ContextManager:
             Context dictionary or None if not found
         """
         try:
-            context_file = self.base_path / f"{document_id}_context.json"
+            context_file = self.base_path / f"{document_id}_context.msgpack"
             if context_file.exists():
-                with open(context_file, 'r') as f:
-                    context = json.load(f)
+                context = msgpack.unpackb(context_file.read_bytes(), raw=False, strict_map_key=False)
                 logger.info(f"Loaded context for document: {document_id}")
                 return context
+            
+            # Contexts saved before the msgpack format were JSON
+            legacy_file = self.base_path / f"{document_id}_context.json"
+            if legacy_file.exists():
+                context = _loads_json(legacy_file.read_bytes())
+                logger.info(f"Loaded legacy JSON context for document: {document_id}")
+                return context
         except Exception as e:
             logger.warning(f"Could not load context: {str(e)}")
         return None
     
+    def load_vector_store(self, document_id: str) -> Optional[FAISSVectorStore]:
+        """Load a vector store saved by IngestionPipeline.ingest.
+        
+        Args:
+            document_id: Document identifier
+            
+        Returns:
+            FAISSVectorStore or None if not found or incompatible
+        """
+        try:
+            vector_store = FAISSVectorStore()
+            vector_store.load(file_prefix=document_id)
+            # Queries are embedded with the configured model, so a store built by
+            # another model must be re-ingested. The index width can't tell: it is
+            # the real embedding width, which EMBEDDING_DIMENSION may misstate.
+            stored_model = vector_store.embedding_model
+            if stored_model is not None and stored_model != config.embedding.model:
+                logger.warning(
+                    f"Saved vector store for {document_id} was built with "
+                    f"{stored_model}, expected {config.embedding.model}"
+                )
+                return None
+            logger.info(f"Loaded vector store for document: {document_id}")
+            return vector_store
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not load vector store: {str(e)}")
+        return None
+    
     @staticmethod
     def get_session_state_summary() -> Dict[str, Any]:
         """Get summary of current session state.
@@ -77,13 +142,16 @@ class ContextManager:
         Returns:
             Dictionary with session state summary
         """
-        summary = {
-            'document_uploaded': st.session_state.get('document_uploaded', False),
-            'document_id': st.session_state.get('document_id'),
-            'has_vector_store': st.session_state.get('vector_store') is not None,
-            'has_orchestrator': st.session_state.get('orchestrator') is not None,
-            'has_kpi_report': st.session_state.get('kpi_report') is not None,
-            'chat_history_length': len(st.session_state.get('chat_history', [])),
-            'chat_messages_length': len(st.session_state.get('chat_messages', [])),
+        # Resolve the session state proxy once instead of per field. The result
+        # is not cached: st.cache_data is shared across sessions and would leak
+        # one user's state into another's summary.
+        get = st.session_state.get
+        return {
+            'document_uploaded': get('document_uploaded', False),
+            'document_id': get('document_id'),
+            'has_vector_store': get('vector_store') is not None,
+            'has_orchestrator': get('orchestrator') is not None,
+            'has_kpi_report': get('kpi_report') is not None,
+            'chat_history_length': len(get('chat_history', ())),
+            'chat_messages_length': len(get('chat_messages', ())),
         }
-        return summary
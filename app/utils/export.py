@@ -1,12 +1,86 @@
 """Report export functionality (Markdown and PDF)."""
 
 import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from io import BytesIO
 
+# Imported once at module load so PDF worker processes don't re-import per task
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib.enums import TA_LEFT, TA_CENTER
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    _REPORTLAB_AVAILABLE = True
+except ImportError:
+    _REPORTLAB_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Markdown patterns used by the PDF converter, compiled once
+_HEADER_RE = re.compile(r'^(#{1,3}) (.*)$')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+
+
+def _clean_line(line: str) -> str:
+    """Strip markdown bold/italic markers and links from a line of text.
+    
+    Args:
+        line: Markdown text line
+        
+    Returns:
+        Plain text line
+    """
+    line = line.replace('*', '')
+    # Most lines carry no links, so skip the regex scan entirely for them
+    if '[' in line:
+        line = _LINK_RE.sub(r'\1', line)
+    return line
+
+
+@lru_cache(maxsize=1)
+def _pdf_styles() -> dict:
+    """Build the PDF paragraph styles once and reuse them across exports.
+    
+    Returns:
+        Dict with 'normal' style and 'headers' mapping header level to
+        (style, spacer height)
+    """
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor='#1a1a1a',
+        spaceAfter=12,
+        alignment=TA_CENTER
+    )
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor='#2c3e50',
+        spaceAfter=10,
+        spaceBefore=12
+    )
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor='#333333',
+        spaceAfter=6,
+        alignment=TA_LEFT
+    )
+    return {
+        'normal': normal_style,
+        'headers': {1: (title_style, 12), 2: (heading_style, 10), 3: (heading_style, 8)},
+    }
+
 
 class ReportExporter:
     """Export reports in various formats."""
@@ -45,12 +119,8 @@ class ReportExporter:
             Tuple of (file_bytes, filename)
         """
         try:
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-            from reportlab.lib.enums import TA_LEFT, TA_CENTER
-            import markdown2
+            if not _REPORTLAB_AVAILABLE:
+                raise ImportError("reportlab")
             
             filename = filename or "bfsi_report.pdf"
             
@@ -58,73 +128,37 @@ class ReportExporter:
             if not filename.endswith('.pdf'):
                 filename += '.pdf'
             
-            # Convert Markdown to HTML
-            html = markdown2.markdown(report)
-            
             # Create PDF buffer
             buffer = BytesIO()
             doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch)
             
             # Styles
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=18,
-                textColor='#1a1a1a',
-                spaceAfter=12,
-                alignment=TA_CENTER
-            )
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor='#2c3e50',
-                spaceAfter=10,
-                spaceBefore=12
-            )
-            normal_style = ParagraphStyle(
-                'CustomNormal',
-                parent=styles['Normal'],
-                fontSize=11,
-                textColor='#333333',
-                spaceAfter=6,
-                alignment=TA_LEFT
-            )
+            styles = _pdf_styles()
+            normal_style = styles['normal']
+            header_styles = styles['headers']
             
-            # Build PDF content
+            # Build PDF content in one pass over the lines
             story = []
-            
-            # Parse HTML and create paragraphs
-            # Simple HTML to PDF conversion (basic implementation)
-            lines = report.split('\n')
-            for line in lines:
+            append = story.append
+            header_match = _HEADER_RE.match
+            for line in report.split('\n'):
                 line = line.strip()
                 if not line:
-                    story.append(Spacer(1, 6))
+                    append(Spacer(1, 6))
                     continue
                 
                 # Handle headers
-                if line.startswith('# '):
-                    story.append(Paragraph(line[2:], title_style))
-                    story.append(Spacer(1, 12))
-                elif line.startswith('## '):
-                    story.append(Paragraph(line[3:], heading_style))
-                    story.append(Spacer(1, 10))
-                elif line.startswith('### '):
-                    story.append(Paragraph(line[4:], heading_style))
-                    story.append(Spacer(1, 8))
-                else:
-                    # Clean up markdown formatting
-                    clean_line = line
-                    # Remove markdown bold/italic
-                    clean_line = clean_line.replace('**', '').replace('*', '')
-                    # Remove markdown links
-                    import re
-                    clean_line = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', clean_line)
-                    
-                    if clean_line:
-                        story.append(Paragraph(clean_line, normal_style))
+                match = header_match(line)
+                if match:
+                    style, space = header_styles[len(match.group(1))]
+                    append(Paragraph(match.group(2), style))
+                    append(Spacer(1, space))
+                    continue
+                
+                # Remove markdown bold/italic markers and links
+                clean_line = _clean_line(line)
+                if clean_line:
+                    append(Paragraph(clean_line, normal_style))
             
             # Build PDF
             doc.build(story)
@@ -137,11 +171,38 @@ class ReportExporter:
             return pdf_bytes, filename
             
         except ImportError:
-            logger.error("reportlab or markdown2 not installed. Cannot export PDF.")
+            logger.error("reportlab not installed. Cannot export PDF.")
             raise ImportError(
-                "PDF export requires reportlab and markdown2. "
-                "Install with: pip install reportlab markdown2"
+                "PDF export requires reportlab. "
+                "Install with: pip install reportlab"
             )
         except Exception as e:
             logger.error(f"Error exporting PDF: {str(e)}")
             raise
+    
+    @staticmethod
+    def export_many(
+        reports: List[str],
+        filenames: Optional[List[Optional[str]]] = None
+    ) -> List[tuple[bytes, str]]:
+        """Export several reports as PDF files in parallel.
+        
+        PDF rendering is CPU-bound in reportlab, so each report is built in
+        its own worker process. A single report is exported in-process.
+        
+        Args:
+            reports: Markdown report contents
+            filenames: Optional filenames, one per report
+            
+        Returns:
+            List of (file_bytes, filename) tuples in the same order as reports
+        """
+        if not reports:
+            return []
+        filenames = filenames or [None] * len(reports)
+        if len(reports) == 1:
+            return [ReportExporter.export_pdf(reports[0], filenames[0])]
+        
+        max_workers = min(len(reports), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(ReportExporter.export_pdf, reports, filenames))
@@ -1,6 +1,7 @@
 """LLM optimizations: KV-caching and speculative decoding."""
 
 import logging
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from langchain_core.language_models import BaseChatModel
 
@@ -8,6 +9,28 @@ from app.config.settings import config
 
 logger = logging.getLogger(__name__)
 
+# Attribute marking an LLM instance that apply_llm_optimizations already handled
+_OPTIMIZED_ATTR = "__optimized__"
+
+
+@lru_cache(maxsize=1)
+def _is_custom_provider() -> bool:
+    """Whether the configured LLM provider is a custom (LiteLLM-style) endpoint."""
+    return config.llm.provider == "custom"
+
+
+def _uses_custom_endpoint(llm: BaseChatModel) -> bool:
+    """Check whether an LLM talks to a custom endpoint.
+    
+    The provider type from config is the reliable signal; a base_url on the
+    LLM or its client is checked as well for additional safety.
+    """
+    return (
+        _is_custom_provider()
+        or getattr(llm, 'base_url', None) is not None
+        or getattr(getattr(llm, 'client', None), 'base_url', None) is not None
+    )
+
 
 def apply_llm_optimizations(llm: BaseChatModel) -> BaseChatModel:
     """Apply KV-caching and speculative decoding optimizations to LLM.
@@ -21,6 +44,10 @@ def apply_llm_optimizations(llm: BaseChatModel) -> BaseChatModel:
     if not config.llm_optimization.enabled:
         return llm
     
+    # Re-wrapping the same LLM (e.g. shared across agents) is a no-op
+    if getattr(llm, _OPTIMIZED_ATTR, False):
+        return llm
+    
     # Apply KV-caching
     if config.llm_optimization.kv_cache_enabled:
         llm = _apply_kv_caching(llm)
@@ -34,6 +61,12 @@ def apply_llm_optimizations(llm: BaseChatModel) -> BaseChatModel:
         f"Speculative Decoding: {config.llm_optimization.speculative_decoding_enabled}"
     )
     
+    try:
+        # Bypass pydantic's field validation; the marker is not a model field
+        object.__setattr__(llm, _OPTIMIZED_ATTR, True)
+    except (AttributeError, TypeError):
+        logger.debug("Could not mark LLM as optimized; optimizations may be re-applied")
+    
     return llm
 
 
@@ -47,14 +80,7 @@ def _apply_kv_caching(llm: BaseChatModel) -> BaseChatModel:
     or may not be supported via explicit parameters. We skip explicit
     configuration for custom endpoints to avoid API errors.
     """
-    # Check provider type from config
-    is_custom_endpoint = config.llm.provider == "custom"
-    
-    # Also check if base_url exists (for additional safety)
-    has_base_url = hasattr(llm, 'base_url') and getattr(llm, 'base_url', None) is not None
-    has_client_base_url = hasattr(llm, 'client') and hasattr(llm.client, 'base_url') and getattr(llm.client, 'base_url', None) is not None
-    
-    is_custom_endpoint = is_custom_endpoint or has_base_url or has_client_base_url
+    is_custom_endpoint = _uses_custom_endpoint(llm)
     
     if is_custom_endpoint:
         # For custom/LiteLLM endpoints, skip explicit KV-caching configuration
@@ -93,14 +119,7 @@ def _apply_speculative_decoding(llm: BaseChatModel) -> BaseChatModel:
         logger.warning("Speculative decoding enabled but no speculative_model specified")
         return llm
     
-    # Check provider type from config (more reliable than checking attributes)
-    is_custom_endpoint = config.llm.provider == "custom"
-    
-    # Also check if base_url exists (for additional safety)
-    has_base_url = hasattr(llm, 'base_url') and getattr(llm, 'base_url', None) is not None
-    has_client_base_url = hasattr(llm, 'client') and hasattr(llm.client, 'base_url') and getattr(llm.client, 'base_url', None) is not None
-    
-    is_custom_endpoint = is_custom_endpoint or has_base_url or has_client_base_url
+    is_custom_endpoint = _uses_custom_endpoint(llm)
     
     if is_custom_endpoint:
         # For LiteLLM/custom endpoints, use headers or model name modification
@@ -118,13 +137,21 @@ def _apply_speculative_decoding(llm: BaseChatModel) -> BaseChatModel:
                 llm.default_headers = {}
             llm.default_headers['x-speculative-model'] = config.llm_optimization.speculative_model
         
-        logger.debug(f"Speculative decoding enabled via headers/model name (custom endpoint): {config.llm_optimization.speculative_model}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Speculative decoding enabled via headers/model name (custom endpoint): %s",
+                config.llm_optimization.speculative_model
+            )
     else:
         # For standard OpenAI/Anthropic APIs, use model_kwargs
         if not hasattr(llm, 'model_kwargs') or llm.model_kwargs is None:
             llm.model_kwargs = {}
         llm.model_kwargs['speculative_model'] = config.llm_optimization.speculative_model
         llm.model_kwargs['speculative_decoding'] = True
-        logger.debug(f"Speculative decoding enabled via model_kwargs (standard API): {config.llm_optimization.speculative_model}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Speculative decoding enabled via model_kwargs (standard API): %s",
+                config.llm_optimization.speculative_model
+            )
     
     return llm
@@ -1,11 +1,28 @@
 """Conversation memory management for chat flow."""
 
 import logging
-from typing import List, Dict, Optional
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Deque, List, Dict, Optional
+
+from app.config.settings import config
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
+class Message:
+    """A single chat message; slotted to keep long histories compact."""
+    
+    role: str
+    content: str
+    
+    def to_dict(self) -> Dict[str, str]:
+        """Return the message as a {"role", "content"} dict (LangChain style)."""
+        return {"role": self.role, "content": self.content}
+
+
 class ConversationMemory:
     """Manages conversation history for chat sessions."""
     
@@ -16,7 +33,8 @@ class ConversationMemory:
             session_id: Optional session identifier
         """
         self.session_id = session_id
-        self.history: List[Dict[str, str]] = []
+        # Ring buffer: once full, appending drops the oldest message
+        self._history: Deque[Message] = deque(maxlen=config.max_history_messages)
     
     def add_message(self, role: str, content: str):
         """Add a message to conversation history.
@@ -25,11 +43,14 @@ class ConversationMemory:
             role: Message role ('user' or 'assistant')
             content: Message content
         """
-        self.history.append({
-            "role": role,
-            "content": content
-        })
-        logger.debug(f"Added {role} message to history (total: {len(self.history)})")
+        self._history.append(Message(role, content))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Added %s message to history (total: %d)", role, len(self._history))
+    
+    def _tail(self, count: Optional[int]) -> List[Dict[str, str]]:
+        """Last ``count`` messages (all when None) as new message dicts."""
+        start = 0 if count is None else max(0, len(self._history) - count)
+        return [message.to_dict() for message in islice(self._history, start, None)]
     
     def get_history(self, max_messages: Optional[int] = None) -> List[Dict[str, str]]:
         """Get conversation history.
@@ -40,13 +61,11 @@ class ConversationMemory:
         Returns:
             List of message dictionaries
         """
-        if max_messages:
-            return self.history[-max_messages:]
-        return self.history.copy()
+        return self._tail(max_messages or None)
     
     def clear(self):
         """Clear conversation history."""
-        self.history = []
+        self._history.clear()
         logger.info("Cleared conversation history")
     
     def get_last_n_exchanges(self, n: int = 5) -> List[Dict[str, str]]:
@@ -58,4 +77,4 @@ class ConversationMemory:
         Returns:
             List of message dictionaries
         """
-        return self.history[-(n * 2):] if len(self.history) > n * 2 else self.history
+        return self._tail(n * 2)
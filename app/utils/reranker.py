@@ -1,7 +1,18 @@
 """BGE Large re-ranker implementation."""
 
+import functools
+import hashlib
+import heapq
 import logging
-from typing import List, Tuple, Optional
+import math
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Sequence, Tuple, Optional
+import numpy as np
+from cachetools import LRUCache
 from langchain_core.documents import Document
 
 from app.config.settings import config
@@ -9,47 +20,850 @@ from app.config.settings import config
 logger = logging.getLogger(__name__)
 
 
+def _top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first.
+    
+    argpartition selects the top k in O(N); only those k are then sorted.
+    """
+    k = min(k, len(scores))
+    if k < len(scores):
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def _digest(text: str) -> bytes:
+    """Compact stable digest of a text for cache keys."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+@functools.lru_cache(maxsize=None)
+def _cuda_oom_errors() -> Tuple[type, ...]:
+    """Exception types signalling CUDA out-of-memory (empty without torch)."""
+    try:
+        import torch
+    except ImportError:
+        return ()
+    return (torch.cuda.OutOfMemoryError,)
+
+
+def _configure_hf_auth():
+    """Export the optional Hugging Face token once, at import time.
+    
+    Keeps os.environ writes out of model loading, where concurrent workers
+    could race on them.
+    """
+    # Optionally use Hugging Face token if available (for better rate limits)
+    hf_token = config.reranker.hf_token
+    if hf_token:
+        # Set Hugging Face token for authentication
+        os.environ["HF_TOKEN"] = hf_token
+        logger.info("Using Hugging Face token for model download")
+
+
+_configure_hf_auth()
+
+
+class _PriorCalibration:
+    """Online least-squares fit of re-ranker score against retrieval score.
+    
+    Running sums are kept across calls, so the fit sharpens as the session
+    goes on. upper_bound predicts the best score a candidate with a given
+    retrieval score is likely to get, padded by a margin of residual standard
+    deviations; it is a statistical bound, not a guarantee.
+    """
+    
+    MIN_SAMPLES = 32
+    
+    def __init__(self, margin: float):
+        """Initialize an empty fit.
+        
+        Args:
+            margin: Residual standard deviations added to the prediction
+        """
+        self.margin = margin
+        self._n = 0
+        self._sx = self._sy = self._sxx = self._sxy = self._syy = 0.0
+        self._lock = threading.Lock()
+    
+    def update(self, priors: np.ndarray, scores: np.ndarray):
+        """Add (retrieval score, re-ranker score) observations."""
+        x = np.asarray(priors, dtype=np.float64)
+        y = np.asarray(scores, dtype=np.float64)
+        finite = np.isfinite(x) & np.isfinite(y)
+        x, y = x[finite], y[finite]
+        with self._lock:
+            self._n += len(x)
+            self._sx += float(x.sum())
+            self._sy += float(y.sum())
+            self._sxx += float(x @ x)
+            self._sxy += float(x @ y)
+            self._syy += float(y @ y)
+    
+    def upper_bound(self, prior: float) -> Optional[float]:
+        """Likely best re-ranker score for a retrieval score, or None if unknown.
+        
+        None is returned until enough samples exist, or when the fit shows no
+        positive relation between the two scores (then no bound is possible).
+        """
+        with self._lock:
+            n, sx, sy, sxx, sxy, syy = self._n, self._sx, self._sy, self._sxx, self._sxy, self._syy
+        if n < self.MIN_SAMPLES:
+            return None
+        var_x = sxx - sx * sx / n
+        cov_xy = sxy - sx * sy / n
+        if var_x <= 0 or cov_xy <= 0:
+            return None
+        slope = cov_xy / var_x
+        intercept = (sy - slope * sx) / n
+        sse = max(syy - sy * sy / n - slope * cov_xy, 0.0)
+        return slope * prior + intercept + self.margin * math.sqrt(sse / (n - 2))
+
+
+class _ScoreRequest:
+    """One caller's pairs waiting in the batching queue."""
+    
+    __slots__ = ("pairs", "scores", "error", "done")
+    
+    def __init__(self, pairs: Sequence[Sequence[str]]):
+        self.pairs = pairs
+        self.scores: Optional[np.ndarray] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class BatchingReranker:
+    """Coalesce concurrent scoring requests into shared compute_score calls.
+    
+    Callers block in submit() while a background worker drains the queue,
+    gathering requests that arrive within max_wait_ms (up to max_batch pairs),
+    scores them in one call and hands each caller back its own slice.
+    """
+    
+    def __init__(
+        self,
+        score_fn: Callable[[List[Sequence[str]]], np.ndarray],
+        max_batch: int,
+        max_wait_ms: int
+    ):
+        """Initialize the batcher and start its worker thread.
+        
+        Args:
+            score_fn: Function scoring a list of (query, document) pairs
+            max_batch: Maximum number of pairs gathered into one call
+            max_wait_ms: Maximum time to wait for more requests to join a batch
+        """
+        self._score_fn = score_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue[_ScoreRequest]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="rerank-batcher", daemon=True)
+        self._worker.start()
+    
+    def submit(self, pairs: Sequence[Sequence[str]]) -> np.ndarray:
+        """Score pairs, sharing the forward pass with concurrent callers.
+        
+        Args:
+            pairs: (query, document) pairs
+            
+        Returns:
+            One score per pair, in input order
+        """
+        request = _ScoreRequest(pairs)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.scores
+    
+    def _run(self):
+        """Worker loop: gather a batch, score it, wake its callers."""
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0].pairs)
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request.pairs)
+            self._process(batch)
+    
+    def _process(self, batch: List[_ScoreRequest]):
+        """Score all pairs in the batch with one call and demux the results."""
+        try:
+            all_pairs = [pair for request in batch for pair in request.pairs]
+            scores = self._score_fn(all_pairs)
+            offset = 0
+            for request in batch:
+                end = offset + len(request.pairs)
+                request.scores = scores[offset:end]
+                offset = end
+        except Exception as e:
+            for request in batch:
+                request.error = e
+        finally:
+            for request in batch:
+                request.done.set()
+
+
+class _CrossEncoderScorer:
+    """compute_score-compatible shim over a sentence-transformers CrossEncoder."""
+    
+    def __init__(self, model):
+        self.model = model
+    
+    def compute_score(self, pairs: Sequence[Sequence[str]], batch_size: int = 32) -> List[float]:
+        """Score (query, document) pairs like FlagReranker.compute_score."""
+        scores = self.model.predict(
+            list(pairs),
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return scores.reshape(-1).tolist()
+
+
+class _PairEncoder:
+    """Build cross-encoder inputs from per-document token ids cached across calls.
+    
+    Documents are tokenized once, without special tokens, and kept in an LRU
+    keyed by a digest of their text; queries are tokenized once per call. Each
+    row is stitched with the tokenizer's own pair template (e.g.
+    [CLS] q [SEP] d [SEP]) and padded to the longest row in the batch.
+    """
+    
+    def __init__(self, tokenizer, max_length: int, max_doc_tokens: int, cache_size: int):
+        """Initialize the encoder.
+        
+        Args:
+            tokenizer: Hugging Face tokenizer of the re-ranker
+            max_length: Maximum tokens per stitched pair, special tokens included
+            max_doc_tokens: Maximum tokens kept per document
+            cache_size: Number of documents whose token ids are cached (0 disables it)
+        """
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.max_doc_tokens = max_doc_tokens
+        self.pad_token_id = tokenizer.pad_token_id or 0
+        self.with_token_types = "token_type_ids" in tokenizer.model_input_names
+        self._budget = max_length - tokenizer.num_special_tokens_to_add(pair=True)
+        self._doc_tok_cache: Optional[LRUCache] = LRUCache(maxsize=cache_size) if cache_size > 0 else None
+        self._lock = threading.Lock()
+    
+    def _tokenize(self, texts: List[str], max_length: int) -> List[List[int]]:
+        """Token ids of each text, without special tokens."""
+        return self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            truncation=True,
+            max_length=max_length
+        )["input_ids"]
+    
+    def _doc_ids(self, docs: List[str]) -> List[List[int]]:
+        """Token ids of each document, tokenizing only cache misses."""
+        if self._doc_tok_cache is None:
+            return self._tokenize(docs, self.max_doc_tokens)
+        
+        keys = [_digest(doc) for doc in docs]
+        with self._lock:
+            ids = [self._doc_tok_cache.get(key) for key in keys]
+        miss_idx = [i for i, doc_ids in enumerate(ids) if doc_ids is None]
+        if miss_idx:
+            encoded = self._tokenize([docs[i] for i in miss_idx], self.max_doc_tokens)
+            with self._lock:
+                for i, doc_ids in zip(miss_idx, encoded):
+                    ids[i] = doc_ids
+                    self._doc_tok_cache[keys[i]] = doc_ids
+        return ids
+    
+    def encode(self, pairs: Sequence[Sequence[str]]) -> dict:
+        """Padded model inputs for (query, document) pairs.
+        
+        Args:
+            pairs: (query, document) pairs
+            
+        Returns:
+            Dict of CPU long tensors (input_ids, attention_mask and, when the
+            model uses them, token_type_ids), one row per pair
+        """
+        import torch
+        
+        queries = list(dict.fromkeys(pair[0] for pair in pairs))
+        # Queries may use at most half the budget so documents always get the rest
+        query_ids = dict(zip(queries, self._tokenize(queries, self._budget // 2)))
+        doc_ids = self._doc_ids([pair[1] for pair in pairs])
+        
+        tokenizer = self.tokenizer
+        rows, type_rows = [], []
+        for pair, d_ids in zip(pairs, doc_ids):
+            q_ids = query_ids[pair[0]]
+            d_ids = d_ids[:self._budget - len(q_ids)]
+            rows.append(tokenizer.build_inputs_with_special_tokens(q_ids, d_ids))
+            if self.with_token_types:
+                type_rows.append(tokenizer.create_token_type_ids_from_sequences(q_ids, d_ids))
+        
+        length = max(len(row) for row in rows)
+        batch = {
+            "input_ids": torch.tensor([row + [self.pad_token_id] * (length - len(row)) for row in rows]),
+            "attention_mask": torch.tensor([[1] * len(row) + [0] * (length - len(row)) for row in rows]),
+        }
+        if self.with_token_types:
+            batch["token_type_ids"] = torch.tensor([row + [0] * (length - len(row)) for row in type_rows])
+        return batch
+
+
+class _PretokenizedScorer:
+    """compute_score-compatible scorer feeding cached token ids to the HF model.
+    
+    Replaces FlagReranker.compute_score, which re-tokenizes every
+    (query, document) pair on each call.
+    """
+    
+    def __init__(self, encoder: _PairEncoder, model):
+        """Place the model for inference.
+        
+        Args:
+            encoder: Pair encoder built on the model's tokenizer
+            model: Hugging Face sequence classification model (compile it after
+                wrapping, so device and dtype are final before tracing)
+        """
+        import torch
+        
+        self._torch = torch
+        self.encoder = encoder
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        model = model.to(self.device)
+        # Matches FlagReranker(use_fp16=True), which only uses fp16 on GPU
+        self.model = (model.half() if self.device.type == "cuda" else model).eval()
+    
+    def compute_score(self, pairs: Sequence[Sequence[str]], batch_size: int = 32) -> List[float]:
+        """Score (query, document) pairs like FlagReranker.compute_score."""
+        torch = self._torch
+        scores: List[float] = []
+        for start in range(0, len(pairs), max(1, batch_size)):
+            encoded = self.encoder.encode(pairs[start:start + batch_size])
+            inputs = {name: tensor.to(self.device) for name, tensor in encoded.items()}
+            with torch.inference_mode():
+                logits = self.model(**inputs, return_dict=True).logits
+            scores.extend(logits.view(-1).float().tolist())
+        return scores
+
+
+class GraphedReranker:
+    """Replay captured CUDA graphs for the re-ranker forward pass.
+    
+    Inputs are padded up to a small set of fixed (batch, seq_len) buckets.
+    The first call hitting a bucket captures a graph for it; later calls copy
+    their tokens into that bucket's static buffers and replay the graph, which
+    skips Python dispatch and kernel launch overhead entirely.
+    """
+    
+    BATCH_BUCKETS = (8, 16, 32)
+    SEQ_BUCKETS = (128, 256, 512)
+    
+    def __init__(self, encoder: _PairEncoder, model):
+        """Move the model to CUDA in fp16 and prepare the graph cache.
+        
+        Args:
+            encoder: Pair encoder built on the model's tokenizer, with a
+                max_length no larger than the largest sequence bucket
+            model: Hugging Face sequence classification model
+        """
+        import torch
+        
+        self._torch = torch
+        self.encoder = encoder
+        tokenizer = encoder.tokenizer
+        self.device = torch.device("cuda")
+        self.model = model.to(self.device).half().eval()
+        self.pad_token_id = tokenizer.pad_token_id or 0
+        self._input_names = [
+            name for name in ("input_ids", "attention_mask", "token_type_ids")
+            if name in tokenizer.model_input_names
+        ]
+        self._graphs = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _bucket(size: int, buckets: Tuple[int, ...]) -> int:
+        """Smallest bucket that fits size (inputs are truncated to the largest)."""
+        for bucket in buckets:
+            if bucket >= size:
+                return bucket
+        return buckets[-1]
+    
+    def _reset(self, static_inputs: dict):
+        """Fill static buffers with padding (one attended token per row)."""
+        for name, buf in static_inputs.items():
+            buf.fill_(self.pad_token_id if name == "input_ids" else 0)
+        static_inputs["attention_mask"][:, 0] = 1
+    
+    def _capture(self, batch_size: int, seq_len: int):
+        """Capture the forward pass for one (batch, seq_len) bucket."""
+        torch = self._torch
+        static_inputs = {
+            name: torch.zeros((batch_size, seq_len), dtype=torch.long, device=self.device)
+            for name in self._input_names
+        }
+        self._reset(static_inputs)
+        
+        # Warm up on a side stream before capture, as CUDA graph capture requires
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream), torch.no_grad():
+            for _ in range(3):
+                self.model(**static_inputs)
+        torch.cuda.current_stream().wait_stream(stream)
+        
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph), torch.no_grad():
+            static_out = self.model(**static_inputs).logits
+        logger.info("Captured re-ranker CUDA graph for batch=%d, seq_len=%d", batch_size, seq_len)
+        return graph, static_inputs, static_out
+    
+    def compute_score(self, pairs: Sequence[Sequence[str]], batch_size: int = 32) -> List[float]:
+        """Score (query, document) pairs like FlagReranker.compute_score."""
+        scores: List[float] = []
+        # Honour smaller batch sizes (e.g. the OOM retry) by using a smaller bucket
+        max_batch = max(1, min(batch_size, self.BATCH_BUCKETS[-1]))
+        for start in range(0, len(pairs), max_batch):
+            chunk = pairs[start:start + max_batch]
+            encoded = self.encoder.encode(chunk)
+            rows, length = encoded["input_ids"].shape
+            key = (self._bucket(rows, self.BATCH_BUCKETS), self._bucket(length, self.SEQ_BUCKETS))
+            
+            with self._lock:
+                entry = self._graphs.get(key)
+                if entry is None:
+                    entry = self._capture(*key)
+                    self._graphs[key] = entry
+                graph, static_inputs, static_out = entry
+                
+                self._reset(static_inputs)
+                for name, buf in static_inputs.items():
+                    buf[:rows, :length].copy_(encoded[name])
+                graph.replay()
+                scores.extend(static_out[:rows].view(-1).float().tolist())
+        return scores
+
+
+class _VLLMScoreClient:
+    """compute_score-compatible client for a vLLM server's /v1/score endpoint."""
+    
+    TIMEOUT_SECONDS = 30.0
+    
+    def __init__(self, endpoint: str, model: str):
+        """Initialize the HTTP client.
+        
+        Args:
+            endpoint: vLLM server base URL
+            model: Model name the server was started with (--served-model-name)
+        """
+        import httpx
+        
+        self.url = f"{endpoint.rstrip('/')}/v1/score"
+        self.model = model
+        self._client = httpx.Client(timeout=self.TIMEOUT_SECONDS)
+    
+    def compute_score(self, pairs: Sequence[Sequence[str]], batch_size: int = 32) -> List[float]:
+        """Score (query, document) pairs like FlagReranker.compute_score."""
+        queries = [pair[0] for pair in pairs]
+        # A single query is sent once and scored against every document
+        text_1 = queries[0] if len(set(queries)) == 1 else queries
+        response = self._client.post(self.url, json={
+            "model": self.model,
+            "text_1": text_1,
+            "text_2": [pair[1] for pair in pairs],
+        })
+        response.raise_for_status()
+        data = response.json()["data"]
+        scores: List[float] = [0.0] * len(pairs)
+        for item in data:
+            scores[item["index"]] = item["score"]
+        return scores
+    
+    def close(self):
+        """Close the underlying HTTP connection pool."""
+        self._client.close()
+
+
+def export_quantized_onnx(model_name: str, output_dir: str) -> Path:
+    """Export a re-ranker checkpoint to ONNX with dynamic INT8 quantization.
+    
+    Produces ``model_qint8_avx512_vnni.onnx`` in output_dir, which the "onnx"
+    backend loads when RERANKER_ONNX_FILE points at it. Intended as a one-time
+    step for checkpoints that don't ship a quantized ONNX file.
+    
+    Args:
+        model_name: Hugging Face model name or local checkpoint path
+        output_dir: Directory to write the quantized model to
+        
+    Returns:
+        Path to the quantized ONNX file
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    except ImportError:
+        raise ImportError(
+            "optimum not installed. "
+            "Install with: pip install optimum[onnxruntime]"
+        )
+    
+    output_path = Path(output_dir)
+    model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+    quantizer = ORTQuantizer.from_pretrained(model)
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    quantizer.quantize(
+        save_dir=output_path,
+        quantization_config=qconfig,
+        file_suffix="qint8_avx512_vnni"
+    )
+    logger.info("Exported quantized ONNX re-ranker to %s", output_path)
+    return output_path / "model_qint8_avx512_vnni.onnx"
+
+
 class BGEReranker:
     """BGE Large re-ranker for improving retrieval quality."""
     
-    def __init__(self):
-        self.model_name = config.reranker.model
+    def __init__(self, model_name: Optional[str] = None):
+        """Initialize the re-ranker.
+        
+        Args:
+            model_name: Model to load (defaults to the configured heavy model,
+                or the fast model when no heavy model is configured)
+        """
+        self.model_name = model_name or config.reranker.heavy_model or config.reranker.fast_model
         self._model = None
         self._tokenizer = None
-        logger.info(f"Initializing BGE re-ranker with model: {self.model_name}")
+        self._batcher: Optional[BatchingReranker] = None
+        # Scores keyed by (query digest, document digest); follow-up turns often
+        # re-retrieve the same chunks for the same refined query
+        self._score_cache: Optional[LRUCache] = (
+            LRUCache(maxsize=config.reranker.cache_size) if config.reranker.cache_size > 0 else None
+        )
+        self._cache_lock = threading.Lock()
+        # Serializes loading so racing threads don't each build a model copy
+        self._load_lock = threading.Lock()
+        # First stage of the cascade, created in _load_model when configured
+        self._fast_reranker: Optional["BGEReranker"] = None
+        # Maps retrieval scores to this model's scores for the early exit
+        self._calibration = _PriorCalibration(config.reranker.early_exit_margin)
+        logger.info("Initializing BGE re-ranker with model: %s", self.model_name)
     
     def _load_model(self):
-        """Lazy load the re-ranker model."""
-        if self._model is None:
+        """Lazy load the re-ranker model for the configured backend."""
+        # The batcher is created last, so once it exists the model is fully ready
+        if self._batcher is not None:
+            return
+        with self._load_lock:
+            if self._batcher is None:
+                self._load_model_locked()
+    
+    def _load_model_locked(self):
+        """Build the model, cascade stage and batcher; caller holds _load_lock."""
+        try:
+            backend = config.reranker.backend
+            if backend == "vllm-http":
+                # Model lives on the vLLM server; nothing to load in-process
+                self._model = _VLLMScoreClient(
+                    config.reranker.endpoint,
+                    config.reranker.served_model
+                )
+            elif self._is_fast_stage():
+                self._model = self._load_fast_model(backend)
+            elif backend == "onnx":
+                self._model = self._load_cross_encoder(
+                    backend="onnx",
+                    model_kwargs={"file_name": config.reranker.onnx_file}
+                )
+            elif backend == "openvino":
+                precision = config.reranker.openvino_precision
+                self._model = self._load_cross_encoder(
+                    backend="openvino",
+                    model_kwargs={"ov_config": {"INFERENCE_PRECISION_HINT": precision}}
+                )
+            else:
+                self._model = self._load_flag_reranker()
+                if config.reranker.cuda_graphs and self._cuda_available():
+                    # Graph replay already removes dispatch overhead; no compile needed
+                    encoder = self._pair_encoder(min(config.reranker.max_length, GraphedReranker.SEQ_BUCKETS[-1]))
+                    self._model = GraphedReranker(encoder, self._model.model)
+                else:
+                    if config.reranker.token_cache_size > 0:
+                        # Wrap first: the scorer moves the model to its final device
+                        # and dtype, so compiling afterwards doesn't trigger a recompile
+                        encoder = self._pair_encoder(config.reranker.max_length)
+                        self._model = _PretokenizedScorer(encoder, self._model.model)
+                    if config.reranker.compile:
+                        self._compile_model()
+            if self._uses_cascade():
+                # The fast model loads lazily on its first scoring call
+                self._fast_reranker = get_reranker(config.reranker.fast_model)
+            self._batcher = BatchingReranker(
+                self._compute_scores,
+                max_batch=config.reranker.max_batch,
+                max_wait_ms=config.reranker.batch_wait_ms
+            )
+            logger.info("Loaded BGE re-ranker model: %s (backend: %s)", self.model_name, backend)
+        except ImportError:
+            raise
+        except Exception as e:
+            logger.error("Error loading re-ranker model: %s", e)
+            logger.info("Note: Hugging Face login is optional but recommended for better rate limits")
+            raise
+    
+    def _uses_cascade(self) -> bool:
+        """Whether this re-ranker is the heavy stage of a fast/heavy cascade.
+        
+        A vLLM server serves a single model, so the cascade is in-process only.
+        """
+        fast_model = config.reranker.fast_model
+        return (
+            bool(fast_model)
+            and fast_model != self.model_name
+            and self.model_name == config.reranker.heavy_model
+            and config.reranker.cascade_top_n > 0
+            and config.reranker.backend != "vllm-http"
+        )
+    
+    def _is_fast_stage(self) -> bool:
+        """Whether this re-ranker loads the configured fast (cascade) model."""
+        fast_model = config.reranker.fast_model
+        return bool(fast_model) and self.model_name == fast_model and fast_model != config.reranker.heavy_model
+    
+    def _load_fast_model(self, backend: str) -> _CrossEncoderScorer:
+        """Load the fast model as a sentence-transformers CrossEncoder.
+        
+        Fast models such as cross-encoder/ms-marco-MiniLM-L6-v2 are
+        sentence-transformers checkpoints rather than FlagEmbedding ones, and
+        don't ship the heavy model's RERANKER_ONNX_FILE, so each backend loads
+        the checkpoint's default weights.
+        
+        Args:
+            backend: Configured re-ranker backend
+        """
+        if backend == "onnx":
+            return self._load_cross_encoder(backend="onnx")
+        if backend == "openvino":
+            precision = config.reranker.openvino_precision
+            return self._load_cross_encoder(
+                backend="openvino",
+                model_kwargs={"ov_config": {"INFERENCE_PRECISION_HINT": precision}}
+            )
+        return self._load_cross_encoder(backend="torch")
+    
+    def _load_flag_reranker(self):
+        """Load the PyTorch FlagReranker."""
+        try:
+            from FlagEmbedding import FlagReranker
+        except ImportError:
+            raise ImportError(
+                "FlagEmbedding not installed. "
+                "Install with: pip install FlagEmbedding"
+            )
+        return FlagReranker(self.model_name, use_fp16=True)
+    
+    @staticmethod
+    def _cuda_available() -> bool:
+        """Whether a CUDA device is usable for the torch backend."""
+        try:
+            import torch
+        except ImportError:
+            return False
+        return torch.cuda.is_available()
+    
+    def _pair_encoder(self, max_length: int) -> _PairEncoder:
+        """Pair encoder over the loaded FlagReranker's tokenizer.
+        
+        Args:
+            max_length: Maximum tokens per stitched pair
+        """
+        return _PairEncoder(
+            self._model.tokenizer,
+            max_length=max_length,
+            max_doc_tokens=config.reranker.max_doc_tokens,
+            cache_size=config.reranker.token_cache_size
+        )
+    
+    def _compile_model(self):
+        """Compile the model forward with torch.compile and warm it up.
+        
+        Works on the FlagReranker or the _PretokenizedScorer wrapping it; the
+        warmup goes through the same compute_score path that serves queries,
+        paying the compile cost at load time instead of on the first user
+        query. Any failure falls back to the eager model.
+        """
+        eager_model = self._model.model
+        try:
+            import torch
+            
+            self._model.model = torch.compile(eager_model, mode="reduce-overhead", fullgraph=False)
+            self._model.compute_score([["warmup", "warmup document"]])
+            logger.info("Compiled re-ranker model with torch.compile")
+        except Exception as e:
+            self._model.model = eager_model
+            logger.warning("torch.compile failed, using eager re-ranker: %s", e)
+    
+    def _load_cross_encoder(self, backend: str, **kwargs) -> _CrossEncoderScorer:
+        """Load a sentence-transformers CrossEncoder behind a compute_score shim.
+        
+        Args:
+            backend: CrossEncoder backend ("torch", "onnx" or "openvino")
+            **kwargs: Extra CrossEncoder arguments (model_kwargs)
+        """
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError:
+            extra = "" if backend == "torch" else f"[{backend}]"
+            raise ImportError(
+                "sentence-transformers not installed. "
+                f"Install with: pip install 'sentence-transformers{extra}>=4.1'"
+            )
+        return _CrossEncoderScorer(CrossEncoder(self.model_name, backend=backend, **kwargs))
+    
+    def _compute_scores(self, pairs: List[Sequence[str]]) -> np.ndarray:
+        """Score (query, document) pairs with the loaded model.
+        
+        Pairs are sorted by document length and scored in sub-batches of
+        similar length, so each batch is padded to a length close to its own
+        documents rather than to the longest document overall. Scores are
+        written back in input order.
+        """
+        batch_size = max(1, config.reranker.batch_size)
+        order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][1]))
+        scores = np.empty(len(pairs), dtype=np.float32)
+        
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            scores[chunk] = self._score_chunk([pairs[i] for i in chunk], batch_size)
+        
+        return scores
+    
+    def _score_chunk(self, pairs: List[Sequence[str]], batch_size: int) -> np.ndarray:
+        """Score one sub-batch, halving the batch size on CUDA out-of-memory.
+        
+        Args:
+            pairs: (query, document) pairs
+            batch_size: Initial batch size passed to compute_score
+            
+        Returns:
+            One float32 score per pair
+        """
+        oom_errors = _cuda_oom_errors()
+        while True:
             try:
-                from FlagEmbedding import FlagReranker
-                import os
+                chunk_scores = self._model.compute_score(pairs, batch_size=batch_size)
+                # A float, list, ndarray or tensor all become one flat float32 array
+                return np.asarray(chunk_scores, dtype=np.float32).reshape(-1)
+            except oom_errors:
+                if batch_size <= 1:
+                    raise
+                batch_size //= 2
+                import torch
                 
-                # Optionally use Hugging Face token if available (for better rate limits)
-                hf_token = os.getenv("HUGGINGFACE_API_TOKEN") or os.getenv("HF_TOKEN")
-                
-                if hf_token:
-                    # Set Hugging Face token for authentication
-                    os.environ["HF_TOKEN"] = hf_token
-                    logger.info("Using Hugging Face token for model download")
-                
-                self._model = FlagReranker(self.model_name, use_fp16=True)
-                logger.info(f"Loaded BGE re-ranker model: {self.model_name}")
-            except ImportError:
-                raise ImportError(
-                    "FlagEmbedding not installed. "
-                    "Install with: pip install FlagEmbedding"
-                )
-            except Exception as e:
-                logger.error(f"Error loading re-ranker model: {str(e)}")
-                logger.info("Note: Hugging Face login is optional but recommended for better rate limits")
-                raise
+                # Release the failed attempt's cached blocks before retrying
+                torch.cuda.empty_cache()
+                logger.warning("CUDA out of memory while re-ranking, retrying with batch_size=%d", batch_size)
+    
+    def _cached_scores(self, query: str, pairs: List[Sequence[str]]) -> np.ndarray:
+        """Score pairs, only sending cache misses to the model.
+        
+        Args:
+            query: Query text shared by all pairs
+            pairs: (query, document) pairs
+            
+        Returns:
+            One score per pair, in input order
+        """
+        if self._score_cache is None:
+            return self._batcher.submit(pairs)
+        
+        query_digest = _digest(query)
+        keys = [(query_digest, _digest(pair[1])) for pair in pairs]
+        scores = np.empty(len(pairs), dtype=np.float32)
+        miss_idx = []
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                score = self._score_cache.get(key)
+                if score is None:
+                    miss_idx.append(i)
+                else:
+                    scores[i] = score
+        
+        if miss_idx:
+            miss_scores = self._batcher.submit([pairs[i] for i in miss_idx])
+            scores[miss_idx] = miss_scores
+            with self._cache_lock:
+                for i, score in zip(miss_idx, miss_scores.tolist()):
+                    self._score_cache[keys[i]] = score
+        return scores
+    
+    def _score_pairs(
+        self,
+        query: str,
+        pairs: List[Sequence[str]],
+        k: int,
+        priors: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score pairs, stopping early once the rest can't reach the top k.
+        
+        Without priors every pair is scored. With priors (retrieval scores,
+        higher is better), pairs are scored in chunks in descending prior
+        order, keeping a heap of the k best scores. Scoring stops when the
+        calibrated bound for the best remaining prior falls below the k-th
+        best score so far.
+        
+        Args:
+            query: Query text shared by all pairs
+            pairs: (query, document) pairs
+            k: Number of results the caller keeps
+            priors: Optional retrieval score per pair
+            
+        Returns:
+            (indices into pairs that were scored, their scores)
+        """
+        chunk_size = config.reranker.early_exit_chunk
+        if priors is None or chunk_size <= 0 or len(pairs) <= max(chunk_size, k):
+            return np.arange(len(pairs)), self._cached_scores(query, pairs)
+        
+        order = np.argsort(-priors, kind="stable")
+        heap: List[float] = []
+        chunks: List[np.ndarray] = []
+        scored = 0
+        while scored < len(order):
+            idx = order[scored:scored + chunk_size]
+            chunk_scores = self._cached_scores(query, [pairs[i] for i in idx])
+            self._calibration.update(priors[idx], chunk_scores)
+            chunks.append(chunk_scores)
+            scored += len(idx)
+            for score in chunk_scores.tolist():
+                if len(heap) < k:
+                    heapq.heappush(heap, score)
+                elif score > heap[0]:
+                    heapq.heapreplace(heap, score)
+            
+            if scored < len(order) and len(heap) == k:
+                bound = self._calibration.upper_bound(float(priors[order[scored]]))
+                if bound is not None and bound < heap[0]:
+                    logger.debug("Early exit after scoring %d of %d documents", scored, len(order))
+                    break
+        
+        return order[:scored], np.concatenate(chunks)
     
     def rerank(
         self,
         query: str,
         documents: List[Document],
-        top_k: Optional[int] = None
+        top_k: Optional[int] = None,
+        prior_scores: Optional[Sequence[float]] = None
     ) -> List[Tuple[Document, float]]:
         """Re-rank documents based on query relevance.
         
@@ -57,44 +871,92 @@ class BGEReranker:
             query: Query text
             documents: List of Document objects to re-rank
             top_k: Number of top results to return (defaults to config value)
+            prior_scores: Optional retrieval score per document (higher is
+                better), letting scoring stop before the low-scoring tail
             
         Returns:
-            List of (Document, relevance_score) tuples, sorted by relevance
+            List of (Document, relevance_score) tuples, sorted by relevance.
+            When scoring is skipped (nothing to cut) or fails, documents are
+            returned in their original order with NaN scores, so callers can
+            tell them apart
         """
         if not documents:
             return []
         
-        self._load_model()
         top_k = top_k or config.reranker.top_k
         
+        # Nothing would be cut, so skip the model and keep retrieval order;
+        # NaN marks the documents as unscored, as in the error fallback
+        if len(documents) <= 1 or (len(documents) <= top_k and not config.reranker.always_score):
+            return [(doc, math.nan) for doc in documents]
+        
+        if prior_scores is not None and len(prior_scores) != len(documents):
+            raise ValueError("prior_scores must have one score per document")
+        
+        self._load_model()
+        
         try:
             # Prepare query-document pairs
-            pairs = []
-            for doc in documents:
-                pairs.append([query, doc.page_content])
-            
-            # Get relevance scores
-            scores = self._model.compute_score(pairs)
-            
-            # Handle single score vs list of scores
-            if isinstance(scores, float):
-                scores = [scores]
-            elif not isinstance(scores, list):
-                scores = list(scores)
+            q = query
+            pairs = [(q, doc.page_content) for doc in documents]
+            priors = None if prior_scores is None else np.asarray(prior_scores, dtype=np.float32)
             
-            # Create document-score pairs
-            doc_scores = list(zip(documents, scores))
+            # Cascade: keep only the fast model's best candidates for the heavy model
+            candidates = documents
+            cascade_top_n = max(config.reranker.cascade_top_n, top_k)
+            if self._fast_reranker is not None and len(pairs) > cascade_top_n:
+                self._fast_reranker._load_model()
+                scored, fast_scores = self._fast_reranker._score_pairs(query, pairs, cascade_top_n, priors)
+                keep = scored[_top_indices(fast_scores, cascade_top_n)]
+                candidates = [documents[i] for i in keep]
+                pairs = [pairs[i] for i in keep]
+                # The heavy stage only sees cascade_top_n candidates; nothing left to skip
+                priors = None
             
-            # Sort by score (descending)
-            doc_scores.sort(key=lambda x: x[1], reverse=True)
+            # Get relevance scores (cached, misses coalesced with concurrent calls)
+            scored, scores = self._score_pairs(query, pairs, top_k, priors)
             
-            # Return top_k
-            results = doc_scores[:top_k]
+            # Select top_k by score (descending); only these become Python floats
+            order = _top_indices(scores, top_k)
+            results = [(candidates[scored[i]], float(scores[i])) for i in order]
             
-            logger.debug(f"Re-ranked {len(documents)} documents, returning top {len(results)}")
+            logger.debug("Re-ranked %d documents, returning top %d", len(candidates), len(results))
             return results
             
         except Exception as e:
-            logger.error(f"Error during re-ranking: {str(e)}")
-            # Fallback: return original documents with dummy scores
-            return [(doc, 0.0) for doc in documents[:top_k]]
+            logger.warning(
+                "Re-ranking failed (%s: %s), returning documents unscored",
+                type(e).__name__,
+                e,
+                extra={"rerank_fallback": 1}
+            )
+            # Fallback: retrieval order, NaN marks the scores as missing
+            return [(doc, math.nan) for doc in documents[:top_k]]
+
+
+_reranker_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_reranker(model_name: str) -> BGEReranker:
+    """One BGEReranker per model name, kept for the life of the process."""
+    return BGEReranker(model_name)
+
+
+def get_reranker(model_name: Optional[str] = None) -> BGEReranker:
+    """Get the process-wide re-ranker for a model.
+    
+    Every caller shares one instance, and therefore one copy of the model
+    weights, per model name. The cache is module-level, so it also survives
+    Streamlit reruns.
+    
+    Args:
+        model_name: Model to load (defaults to the same model as BGEReranker())
+        
+    Returns:
+        Shared BGEReranker instance
+    """
+    model_name = model_name or config.reranker.heavy_model or config.reranker.fast_model
+    # lru_cache doesn't block concurrent misses, which would each build an instance
+    with _reranker_lock:
+        return _cached_reranker(model_name)
@@ -0,0 +1,116 @@
+"""Tests for ContextManager persistence."""
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+pytest.importorskip("msgpack")
+pytest.importorskip("zstandard")
+pytest.importorskip("streamlit")
+pytest.importorskip("dotenv")
+pytest.importorskip("langchain_core")
+
+from langchain_core.documents import Document
+
+from app.config.settings import config
+from app.ingestion.vector_store import FAISSVectorStore
+from app.utils.context_manager import ContextManager
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    """Point the vector store at a temporary directory."""
+    monkeypatch.setattr(config.vector_store, "index_path", tmp_path / "store" / "faiss_index")
+    monkeypatch.setattr(config.vector_store, "store_path", tmp_path / "store")
+    monkeypatch.setattr(config.vector_store, "use_gpu", False)
+    return tmp_path / "store"
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ContextManager(base_path=tmp_path / "context")
+
+
+def test_session_context_round_trip(manager):
+    """Plain values survive save/load; live objects are skipped, others stringified."""
+    context = {
+        "document_id": "abc123",
+        "document_uploaded": True,
+        "chunk_count": 42,
+        "score": 0.75,
+        "kpi_report": {"revenue": [1.5, 2.5], "notes": None},
+        "vector_store": object(),
+        "orchestrator": object(),
+        "file_path": manager.base_path / "report.pdf",
+    }
+
+    manager.save_session_context("abc123", context)
+    loaded = manager.load_session_context("abc123")
+
+    assert (manager.base_path / "abc123_context.msgpack").exists()
+    assert loaded == {
+        "document_id": "abc123",
+        "document_uploaded": True,
+        "chunk_count": 42,
+        "score": 0.75,
+        "kpi_report": {"revenue": [1.5, 2.5], "notes": None},
+        "file_path": str(manager.base_path / "report.pdf"),
+    }
+
+
+def test_numpy_values_are_saved_as_lists(manager):
+    manager.save_session_context("doc", {"scores": {"top": np.float32(0.5), "all": np.arange(3)}})
+
+    assert manager.load_session_context("doc") == {"scores": {"top": 0.5, "all": [0, 1, 2]}}
+
+
+def test_load_legacy_json_context(manager):
+    """Contexts saved as JSON before the msgpack format still load."""
+    legacy = {"document_id": "old", "chat_history": [{"role": "user", "content": "hi"}]}
+    (manager.base_path / "old_context.json").write_text(json.dumps(legacy))
+
+    assert manager.load_session_context("old") == legacy
+
+
+def test_msgpack_context_preferred_over_legacy_json(manager):
+    (manager.base_path / "doc_context.json").write_text(json.dumps({"version": "json"}))
+    manager.save_session_context("doc", {"version": "msgpack"})
+
+    assert manager.load_session_context("doc") == {"version": "msgpack"}
+
+
+def test_load_missing_context(manager):
+    assert manager.load_session_context("missing") is None
+
+
+def _save_store(prefix, dimension=8):
+    store = FAISSVectorStore(dimension=dimension)
+    documents = [Document(page_content=f"chunk {i}", metadata={"page": i}) for i in range(3)]
+    store.add_documents(documents, np.eye(3, dimension, dtype=np.float32))
+    store.save(file_prefix=prefix)
+    return store
+
+
+def test_load_vector_store_ignores_configured_dimension(manager, monkeypatch):
+    """A misconfigured EMBEDDING_DIMENSION must not invalidate every saved store."""
+    _save_store("doc", dimension=8)
+    monkeypatch.setattr(config.embedding, "dimension", 768)
+
+    store = manager.load_vector_store("doc")
+
+    assert store is not None
+    assert store.index.d == 8
+    assert store.get_document_count() == 3
+
+
+def test_load_vector_store_rejects_other_model(manager, monkeypatch):
+    _save_store("doc")
+    monkeypatch.setattr(config.embedding, "model", "some-other/embedding-model")
+
+    assert manager.load_vector_store("doc") is None
+
+
+def test_load_vector_store_missing(manager):
+    assert manager.load_vector_store("missing") is None
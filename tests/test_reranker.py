@@ -0,0 +1,94 @@
+"""Tests for the re-ranker's prior-score early exit."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cachetools")
+pytest.importorskip("dotenv")
+pytest.importorskip("langchain_core")
+
+from langchain_core.documents import Document
+
+from app.config.settings import config
+from app.utils import reranker as reranker_module
+
+
+class _StubBatcher:
+    """Stands in for BatchingReranker; scores documents from a lookup table."""
+
+    def __init__(self, scores):
+        self.scores = scores
+        self.scored = 0
+
+    def submit(self, pairs):
+        self.scored += len(pairs)
+        return np.array([self.scores[doc] for _, doc in pairs], dtype=np.float32)
+
+
+def _make_reranker(scores):
+    """BGEReranker with a stub model, no score cache and no cascade."""
+    reranker = reranker_module.BGEReranker("stub-model")
+    reranker._batcher = _StubBatcher(scores)
+    reranker._score_cache = None
+    return reranker
+
+
+def _low_prior_winner(n=40):
+    """Documents in descending prior order; the last (lowest prior) scores best.
+
+    The other scores alternate between 1.0 and -1.0, so retrieval score says
+    little about re-ranker score.
+    """
+    texts = [f"doc {i}" for i in range(n)]
+    priors = np.linspace(0.9, 0.5, n).tolist()
+    scores = {text: (1.0 if i % 2 == 0 else -1.0) for i, text in enumerate(texts)}
+    scores[texts[-1]] = 5.0
+    return [Document(page_content=text) for text in texts], priors, scores
+
+
+def test_low_prior_document_kept_by_default(monkeypatch):
+    """With the default (disabled) early exit, every candidate is scored."""
+    monkeypatch.setattr(config.reranker, "early_exit_chunk", 0)
+    documents, priors, scores = _low_prior_winner()
+    reranker = _make_reranker(scores)
+
+    results = reranker.rerank("query", documents, top_k=3, prior_scores=priors)
+
+    assert results[0][0].page_content == documents[-1].page_content
+    assert results[0][1] == pytest.approx(5.0)
+    assert reranker._batcher.scored == len(documents)
+
+
+def test_early_exit_keeps_low_prior_document_when_fit_is_weak(monkeypatch):
+    """Early exit must not stop when retrieval score doesn't predict the re-ranker score."""
+    monkeypatch.setattr(config.reranker, "early_exit_chunk", 8)
+    monkeypatch.setattr(config.reranker, "early_exit_margin", 2.0)
+    documents, priors, scores = _low_prior_winner()
+    reranker = _make_reranker(scores)
+
+    results = reranker.rerank("query", documents, top_k=3, prior_scores=priors)
+
+    assert results[0][0].page_content == documents[-1].page_content
+    assert reranker._batcher.scored == len(documents)
+
+
+def test_early_exit_matches_full_scoring_top_k(monkeypatch):
+    """Where early exit does stop, it returns the same top k as scoring everything."""
+    texts = [f"doc {i}" for i in range(64)]
+    priors = np.linspace(1.0, 0.0, len(texts)).tolist()
+    # Re-ranker score tracks the prior closely, so the tail can safely be skipped
+    scores = {text: 10.0 * prior + 0.01 * (i % 3) for i, (text, prior) in enumerate(zip(texts, priors))}
+    documents = [Document(page_content=text) for text in texts]
+
+    monkeypatch.setattr(config.reranker, "early_exit_chunk", 0)
+    full = _make_reranker(scores).rerank("query", documents, top_k=5, prior_scores=priors)
+
+    monkeypatch.setattr(config.reranker, "early_exit_chunk", 8)
+    early = _make_reranker(scores)
+    # Warm the calibration the way an ongoing session would
+    early.rerank("warmup", documents, top_k=5, prior_scores=priors)
+    early._batcher.scored = 0
+    results = early.rerank("query", documents, top_k=5, prior_scores=priors)
+
+    assert [doc.page_content for doc, _ in results] == [doc.page_content for doc, _ in full]
+    assert early._batcher.scored < len(documents)
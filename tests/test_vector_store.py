@@ -0,0 +1,105 @@
+"""Tests for FAISSVectorStore persistence."""
+
+import pickle
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+pytest.importorskip("msgpack")
+pytest.importorskip("zstandard")
+pytest.importorskip("dotenv")
+pytest.importorskip("langchain_core")
+
+from langchain_core.documents import Document
+
+from app.config.settings import config
+from app.ingestion.vector_store import FAISSVectorStore
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    """Point the vector store at a temporary directory."""
+    monkeypatch.setattr(config.vector_store, "index_path", tmp_path / "faiss_index")
+    monkeypatch.setattr(config.vector_store, "store_path", tmp_path)
+    monkeypatch.setattr(config.vector_store, "use_gpu", False)
+    return tmp_path
+
+
+def _documents():
+    """Documents with non-ASCII text and nested metadata."""
+    return [
+        Document(page_content="Net interest margin rose to 3.1%", metadata={"page": 1, "source": "q3.pdf"}),
+        Document(page_content="Crédit à la consommation — €2bn", metadata={"page": 2, "tags": ["retail", "eu"]}),
+        Document(page_content="", metadata={}),
+        Document(page_content="CET1 ratio of 13.4%", metadata={"page": 4, "table": {"row": 3}}),
+    ]
+
+
+def _embeddings(n, dimension=8):
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((n, dimension)).astype(np.float32)
+
+
+def _assert_same_documents(actual, expected):
+    assert [doc.page_content for doc in actual] == [doc.page_content for doc in expected]
+    assert [doc.metadata for doc in actual] == [doc.metadata for doc in expected]
+
+
+def test_save_load_round_trip(store_dir):
+    """Documents, metadata, vectors and the embedding model survive save/load."""
+    documents = _documents()
+    embeddings = _embeddings(len(documents))
+    store = FAISSVectorStore(dimension=8)
+    store.add_documents(documents, embeddings)
+    store.save(file_prefix="doc1")
+
+    assert (store_dir / "doc1.docs").exists()
+    assert not (store_dir / "doc1.pkl").exists()
+
+    loaded = FAISSVectorStore()
+    loaded.load(file_prefix="doc1")
+
+    _assert_same_documents(loaded.documents, documents)
+    assert loaded.index.ntotal == len(documents)
+    assert loaded.dimension == 8
+    assert loaded.embedding_model == config.embedding.model
+    # Each stored vector is still its own nearest neighbour
+    for i, embedding in enumerate(embeddings):
+        (doc, score), = loaded.search(embedding, k=1)
+        assert doc.page_content == documents[i].page_content
+        assert score == pytest.approx(1.0, abs=1e-5)
+
+
+def test_save_does_not_modify_caller_embeddings():
+    """Normalization happens on a copy, not the caller's array."""
+    embeddings = _embeddings(3)
+    original = embeddings.copy()
+    store = FAISSVectorStore(dimension=8)
+    store.add_documents(_documents()[:3], embeddings)
+    store.save(file_prefix="doc1")
+
+    np.testing.assert_array_equal(embeddings, original)
+
+
+def test_load_legacy_pickle(store_dir):
+    """Stores saved before the msgpack format (a pickled Document list) still load."""
+    documents = _documents()
+    store = FAISSVectorStore(dimension=8)
+    store.add_documents(documents, _embeddings(len(documents)))
+    store.save(file_prefix="legacy")
+    (store_dir / "legacy.docs").unlink()
+    (store_dir / "legacy.pkl").write_bytes(pickle.dumps(documents))
+
+    loaded = FAISSVectorStore()
+    loaded.load(file_prefix="legacy")
+
+    _assert_same_documents(loaded.documents, documents)
+    assert loaded.index.ntotal == len(documents)
+    # Legacy stores did not record which model built them
+    assert loaded.embedding_model is None
+
+
+def test_load_missing_store_raises():
+    with pytest.raises(FileNotFoundError):
+        FAISSVectorStore().load(file_prefix="missing")
@@ -0,0 +1,157 @@
+"""Tests for the web search result cache and in-flight deduplication."""
+
+import threading
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("httpcore")
+pytest.importorskip("certifi")
+pytest.importorskip("cachetools")
+
+from cachetools import TTLCache
+
+from app.tools.web_search import WebSearchTool
+
+
+class _StubProvider:
+    """Stands in for WebSearchTool._search_provider and counts calls."""
+
+    def __init__(self, results=None):
+        if results is None:
+            results = [{"title": "Result", "snippet": "Snippet", "url": "https://example.com"}]
+        self.results = results
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, query, max_results):
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(timeout=5)
+        return [dict(result, query=query) for result in self.results]
+
+
+class _Clock:
+    """Manually advanced timer for TTLCache."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def tool():
+    tool = WebSearchTool(api_key="test-key", provider="tavily")
+    yield tool
+    tool.close()
+
+
+def test_repeated_query_is_served_from_cache(tool):
+    provider = _StubProvider()
+    tool._search_provider = provider
+
+    first = tool.search("ECB rate decision", max_results=3)
+    # Normalized (case and surrounding whitespace) queries share the entry
+    second = tool.search("  ecb RATE decision ", max_results=3)
+
+    assert provider.calls == 1
+    assert second == first
+
+
+def test_cached_results_are_copies(tool):
+    tool._search_provider = _StubProvider()
+
+    first = tool.search("query")
+    first[0]["title"] = "mutated"
+    first.append({"title": "extra"})
+
+    assert tool.search("query") == [
+        {"title": "Result", "snippet": "Snippet", "url": "https://example.com", "query": "query"}
+    ]
+
+
+def test_cache_key_includes_max_results(tool):
+    provider = _StubProvider()
+    tool._search_provider = provider
+
+    tool.search("query", max_results=3)
+    tool.search("query", max_results=5)
+
+    assert provider.calls == 2
+
+
+def test_cache_entries_expire(tool):
+    provider = _StubProvider()
+    tool._search_provider = provider
+    clock = _Clock()
+    tool._cache = TTLCache(maxsize=512, ttl=300, timer=clock)
+
+    tool.search("query")
+    clock.now = 299.0
+    tool.search("query")
+    assert provider.calls == 1
+
+    clock.now = 301.0
+    tool.search("query")
+    assert provider.calls == 2
+
+
+def test_empty_results_are_not_cached(tool):
+    provider = _StubProvider(results=[])
+    tool._search_provider = provider
+
+    assert tool.search("query") == []
+    assert tool.search("query") == []
+    assert provider.calls == 2
+
+
+def test_concurrent_identical_queries_share_one_request(tool):
+    provider = _StubProvider()
+    provider.release.clear()
+    tool._search_provider = provider
+    results = []
+    results_lock = threading.Lock()
+
+    def run():
+        found = tool.search("Basel III")
+        with results_lock:
+            results.append(found)
+
+    leader = threading.Thread(target=run)
+    leader.start()
+    assert provider.started.wait(timeout=5)
+    # The leader is now blocked inside the provider with the search in flight
+    followers = [threading.Thread(target=run) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    provider.release.set()
+    for thread in [leader, *followers]:
+        thread.join(timeout=5)
+
+    assert provider.calls == 1
+    assert len(results) == 5
+    assert all(found == results[0] for found in results)
+    # Each caller gets its own copy
+    assert len({id(found) for found in results}) == 5
+    assert tool._inflight == {}
+
+
+def test_failed_search_propagates_and_is_not_cached(tool):
+    calls = []
+
+    def failing(query, max_results):
+        calls.append(query)
+        raise RuntimeError("provider down")
+
+    tool._search_provider = failing
+
+    with pytest.raises(RuntimeError):
+        tool.search("query")
+    with pytest.raises(RuntimeError):
+        tool.search("query")
+    assert len(calls) == 2
+    assert tool._inflight == {}